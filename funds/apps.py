@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FundsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'funds'
+
+    def ready(self):
+        from . import signals
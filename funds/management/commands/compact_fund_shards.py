@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from funds.models import FundCounterShard
+
+class Command(BaseCommand):
+    help = "Fold each project's fund counter shards back into a single row"
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write(self.style.NOTICE("Start Compacting Fund Counter Shards"))
+            num_projects = FundCounterShard.compact()
+            self.stdout.write(self.style.SUCCESS(f"Fund Counter Shards Compacted for {num_projects} Projects."))
+
+        except CommandError as e:
+            print(e)
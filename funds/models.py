@@ -1,3 +1,116 @@
-from django.db import models
+import random
+from collections                    import defaultdict
+from decimal                        import Decimal
 
-# Create your models here.
+from django.db                      import models, transaction, IntegrityError
+from django.db.models               import F, Sum
+
+class LedgerEntry(models.Model):
+    """
+    Append-only record of every donation. Projects, users and donations are referenced by
+    plain ids rather than foreign keys, so deleting any of them leaves the history intact.
+    """
+    project_id  = models.BigIntegerField()
+    user_id     = models.BigIntegerField()
+    donation_id = models.BigIntegerField(unique=True)
+    amount      = models.DecimalField(max_digits=15, decimal_places=2)
+    created_at  = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "fund_ledger_entries"
+        indexes  = [
+            models.Index(fields=["project_id", "created_at"]),
+        ]
+
+    @classmethod
+    def record(cls, donations):
+        if any(donation.id is None for donation in donations):
+            raise ValueError("Only saved donations can be recorded in the ledger.")
+
+        entries = cls.objects.bulk_create([cls(
+            project_id  = donation.project_id,
+            user_id     = donation.user_id,
+            donation_id = donation.id,
+            amount      = donation.funding_option.amount
+        ) for donation in donations])
+
+        totals = defaultdict(lambda: [Decimal(0), 0])
+
+        for entry in entries:
+            totals[entry.project_id][0] += entry.amount
+            totals[entry.project_id][1] += 1
+
+        for project_id, (amount, count) in totals.items():
+            FundCounterShard.add(project_id, amount, count)
+
+        return entries
+
+class FundCounterShard(models.Model):
+    """
+    One of up to ``NUM_SHARDS`` running totals per project.
+
+    Writers add to a random shard, so concurrent donations to a hot project spread their
+    row locks over several rows; readers add the shards up. ``compact`` folds a project's
+    shards back into one row so reads stay cheap. These are the only counters a donation
+    request updates: ``ProjectStats`` catches up from the ``stats.donations`` outbox event.
+    """
+    NUM_SHARDS = 8
+
+    project = models.ForeignKey("projects.Project", on_delete=models.CASCADE)
+    shard   = models.PositiveSmallIntegerField()
+    amount  = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    count   = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table    = "fund_counter_shards"
+        constraints = [
+            models.UniqueConstraint(fields=["project", "shard"], name="fund_counter_shards_project_shard_unique"),
+        ]
+
+    @classmethod
+    def add(cls, project_id, amount, count):
+        shard   = random.randrange(cls.NUM_SHARDS)
+        changes = {'amount': F('amount') + amount, 'count': F('count') + count}
+
+        if cls.objects.filter(project_id=project_id, shard=shard).update(**changes):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(project_id=project_id, shard=shard, amount=amount, count=count)
+        except IntegrityError:
+            cls.objects.filter(project_id=project_id, shard=shard).update(**changes)
+
+    @classmethod
+    def totals(cls, project_ids):
+        rows = cls.objects.filter(project_id__in=project_ids)\
+                          .values('project_id')\
+                          .annotate(total_amount=Sum('amount'), total_count=Sum('count'))\
+                          .values_list('project_id', 'total_amount', 'total_count')
+
+        return {project_id: (amount, count) for project_id, amount, count in rows}
+
+    @classmethod
+    def compact(cls, project_ids=None):
+        shards = cls.objects.all() if project_ids is None else cls.objects.filter(project_id__in=project_ids)
+        sparse = shards.values('project_id')\
+                       .annotate(num_shards=models.Count('id'))\
+                       .filter(num_shards__gt=1)\
+                       .values_list('project_id', flat=True)
+
+        for project_id in list(sparse):
+            with transaction.atomic():
+                rows = list(cls.objects.select_for_update().filter(project_id=project_id).order_by('shard'))
+
+                if len(rows) < 2:
+                    continue
+
+                kept, folded = rows[0], rows[1:]
+
+                cls.objects.filter(id__in=[row.id for row in folded]).delete()
+                cls.objects.filter(id=kept.id).update(
+                    amount = F('amount') + sum(row.amount for row in folded),
+                    count  = F('count') + sum(row.count for row in folded)
+                )
+
+        return len(sparse)
@@ -0,0 +1,8 @@
+from django.dispatch    import receiver
+
+from projects.signals   import donations_created
+from .models            import LedgerEntry
+
+@receiver(donations_created)
+def record_ledger_entries(sender, donations, **kwargs):
+    LedgerEntry.record(donations)
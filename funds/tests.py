@@ -1,3 +1,109 @@
-from django.test import TestCase
+from io                         import StringIO
 
-# Create your tests here.
+from django.db                  import connection
+from django.test                import TestCase, Client
+from django.test.utils          import CaptureQueriesContext
+from django.core.management     import call_command
+
+from users.models               import User
+from projects.models            import Project, Category, FundingOption, Donation, ProjectStats
+from projects.outbox            import outbox
+from funds.models               import LedgerEntry, FundCounterShard
+from utils.auth                 import hash_password, issue_token
+
+class FundLedgerTest(TestCase):
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.options = [FundingOption.objects.create(
+            amount      = amount,
+            project     = self.project,
+            title       = '상품옵션',
+            description = '상품설명'
+        ) for amount in (1000, 3000)]
+
+    def donate(self, option, count):
+        for _ in range(count):
+            Donation.objects.create(user=self.user, project=self.project, funding_option=option)
+
+    def test_fund_ledger_records_donations(self):
+        self.donate(self.options[0], 20)
+        self.donate(self.options[1], 5)
+
+        self.assertEqual(LedgerEntry.objects.filter(project_id=self.project.id).count(), 25)
+        self.assertGreater(FundCounterShard.objects.filter(project=self.project).count(), 1)
+        self.assertEqual(FundCounterShard.totals([self.project.id])[self.project.id], (35000, 25))
+
+    def test_fund_ledger_records_bulk_donations(self):
+        response = Client().put(
+            f'/projects/{self.project.id}', {'options': [{'option_id': self.options[1].id, 'quantity': 3}]},
+            HTTP_AUTHORIZATION=issue_token(self.user), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(FundCounterShard.totals([self.project.id])[self.project.id], (9000, 3))
+
+    def test_fund_ledger_donations_skip_project_stats_row(self):
+        with CaptureQueriesContext(connection) as context:
+            response = Client().put(
+                f'/projects/{self.project.id}', {'options': [{'option_id': self.options[0].id, 'quantity': 2}]},
+                HTTP_AUTHORIZATION=issue_token(self.user), content_type='application/json'
+            )
+
+        stats_table = connection.ops.quote_name(ProjectStats._meta.db_table)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([query['sql'] for query in context.captured_queries if query['sql'].startswith(f'UPDATE {stats_table}')], [])
+
+        outbox.drain()
+        stats = ProjectStats.objects.get(project=self.project)
+
+        self.assertEqual((stats.funding_amount, stats.funding_count), FundCounterShard.totals([self.project.id])[self.project.id])
+
+    def test_fund_ledger_links_donations(self):
+        Client().put(
+            f'/projects/{self.project.id}', {'options': [{'option_id': option.id, 'quantity': 2} for option in self.options]},
+            HTTP_AUTHORIZATION=issue_token(self.user), content_type='application/json'
+        )
+
+        entries   = LedgerEntry.objects.order_by('donation_id').values_list('donation_id', 'user_id', 'amount')
+        donations = Donation.objects.order_by('id').values_list('id', 'user_id', 'funding_option__amount')
+
+        self.assertEqual(len(entries), 4)
+        self.assertEqual(list(entries), list(donations))
+
+    def test_fund_ledger_survives_deletes(self):
+        self.donate(self.options[0], 2)
+
+        donation_ids = set(Donation.objects.values_list('id', flat=True))
+        self.user.delete()
+
+        self.assertEqual(set(LedgerEntry.objects.filter(project_id=self.project.id).values_list('donation_id', flat=True)), donation_ids)
+
+    def test_fund_counter_shards_compact(self):
+        self.donate(self.options[0], 20)
+
+        call_command('compact_fund_shards', stdout=StringIO())
+
+        self.assertEqual(list(FundCounterShard.objects.filter(project=self.project).values_list('amount', 'count')), [(20000, 20)])
+
+    def test_project_fund_view(self):
+        self.donate(self.options[1], 2)
+
+        response = Client().get(f'/funds/projects/{self.project.id}')
+
+        self.assertEqual(response.json(), {'status': 'SUCCESS', 'data': {
+            'project_id'    : self.project.id,
+            'funding_amount': 6000.0,
+            'funding_count' : 2,
+        }})
+        self.assertEqual(Client().get('/funds/projects/999').status_code, 404)
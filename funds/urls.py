@@ -0,0 +1,6 @@
+from django.urls    import path
+from funds.views    import ProjectFundView
+
+urlpatterns = [
+    path('/projects/<int:project_id>', ProjectFundView.as_view()),
+]
@@ -1,3 +1,20 @@
-from django.shortcuts import render
+from decimal            import Decimal
 
-# Create your views here.
+from django.http        import JsonResponse
+from django.views       import View
+
+from funds.models       import FundCounterShard
+from projects.models    import Project
+
+class ProjectFundView(View):
+    def get(self, request, project_id):
+        if not Project.objects.filter(id=project_id).exists():
+            return JsonResponse({"status": "INVALID_PROJECT_ERROR", "message": "Project does not exist."}, status=404)
+
+        amount, count = FundCounterShard.totals([project_id]).get(project_id, (Decimal(0), 0))
+
+        return JsonResponse({'status': "SUCCESS", "data": {
+            'project_id'    : project_id,
+            'funding_amount': float(amount),
+            'funding_count' : count,
+        }}, status=200)
@@ -0,0 +1,172 @@
+import queue
+import threading
+import time
+from collections        import defaultdict
+
+from django.conf        import settings
+from django.db          import connection, transaction
+from django.db.models   import F
+
+from .models            import FundingOption, Donation, RewardHold
+from .signals           import donations_created
+
+class PendingDonation:
+    def __init__(self, user, quantities):
+        self.user       = user
+        self.quantities = quantities
+        self.result     = None
+        self.state      = 'queued'
+        self.lock       = threading.Lock()
+        self.done       = threading.Event()
+
+    def claim(self):
+        with self.lock:
+            if self.state == 'cancelled':
+                return False
+
+            self.state = 'processing'
+            return True
+
+    def cancel(self):
+        with self.lock:
+            if self.state != 'queued':
+                return False
+
+            self.state = 'cancelled'
+            return True
+
+class DonationBatcher:
+    """
+    Group commit for ``PUT /projects/<id>`` while ``DONATION_BATCHING`` is on.
+
+    Requests hand their options to a single writer thread per process and wait. The writer
+    collects whatever arrives within ``DONATION_BATCH_WINDOW_MS`` (up to
+    ``DONATION_BATCH_SIZE`` requests), locks the options involved once, hands out stock to
+    the requests in arrival order, and commits every accepted donation in one transaction
+    with one UPDATE per option and a single multi-row INSERT (``Donation.create_batch``, plus
+    one SELECT for the new keys where the backend can't return them). Each request still
+    gets its own ``SUCCESS`` or ``NO_STOCK``. If
+    the batch transaction fails, nothing was written and every request in it falls back to
+    the regular single-request path. A request still queued after ``RESULT_TIMEOUT`` is
+    cancelled and answered with ``DONATION_TIMEOUT``; once the writer has picked it up, the
+    request waits for the batch outcome, so a donation is never executed twice.
+    """
+    RESULT_TIMEOUT = 30
+
+    def __init__(self):
+        self.lock    = threading.Lock()
+        self.pending = queue.Queue()
+        self.worker  = None
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'DONATION_BATCHING', False)
+
+    def submit(self, user, quantities):
+        if not self.enabled or connection.in_atomic_block:
+            return None
+
+        pending = PendingDonation(user, quantities)
+
+        self.start()
+        self.pending.put(pending)
+
+        if pending.done.wait(self.RESULT_TIMEOUT) or not pending.cancel():
+            pending.done.wait()
+            return pending.result
+
+        return 'DONATION_TIMEOUT'
+
+    def start(self):
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.run, name='donation-batcher', daemon=True)
+                self.worker.start()
+
+    def run(self):
+        while True:
+            batch     = self.collect()
+            results   = []
+            committed = threading.Event()
+
+            try:
+                self.process(batch, results, committed)
+            except Exception:
+                connection.close()
+
+                if not committed.is_set():
+                    results = [None] * len(batch)
+
+            for pending, result in zip(batch, results):
+                pending.result = result
+                pending.done.set()
+
+    def collect(self):
+        batch = []
+
+        while not batch:
+            pending = self.pending.get()
+
+            if pending.claim():
+                batch.append(pending)
+
+        deadline = time.monotonic() + getattr(settings, 'DONATION_BATCH_WINDOW_MS', 5) / 1000
+        size     = getattr(settings, 'DONATION_BATCH_SIZE', 200)
+
+        while len(batch) < size:
+            timeout = deadline - time.monotonic()
+
+            try:
+                pending = self.pending.get(timeout=timeout) if timeout > 0 else self.pending.get_nowait()
+            except queue.Empty:
+                break
+
+            if pending.claim():
+                batch.append(pending)
+
+        return batch
+
+    def process(self, batch, results, committed):
+        option_ids = {option_id for pending in batch for option_id in pending.quantities}
+        taken      = defaultdict(int)
+        accepted   = []
+
+        with transaction.atomic():
+            transaction.on_commit(committed.set)
+
+            funding_options = FundingOption.objects.select_for_update().in_bulk(list(option_ids))
+            gated           = set(RewardHold.objects.filter(funding_option_id__in=option_ids)
+                                                    .values_list('funding_option_id', flat=True)
+                                                    .distinct())
+
+            for pending in batch:
+                limited = [option_id for option_id in pending.quantities
+                           if option_id in funding_options and funding_options[option_id].remains is not None]
+
+                if any(option_id not in funding_options for option_id in pending.quantities):
+                    results.append("FUNDING_OPTION_ID_DOES_NOT EXIST")
+                elif any(option_id in gated for option_id in limited):
+                    results.append('HOLD_REQUIRED' if all(pending.quantities[option_id] == 1 for option_id in limited if option_id in gated) else 'INVALID_OPTIONS')
+                elif any(funding_options[option_id].remains - taken[option_id] < pending.quantities[option_id] for option_id in limited):
+                    results.append('NO_STOCK')
+                else:
+                    for option_id in limited:
+                        taken[option_id] += pending.quantities[option_id]
+
+                    accepted.append(pending)
+                    results.append('SUCCESS')
+
+            for option_id, quantity in taken.items():
+                if not FundingOption.objects.filter(id=option_id, remains__gte=quantity).update(remains=F('remains') - quantity):
+                    raise RuntimeError(f'Funding option {option_id} changed under the batch lock.')
+
+            donations = Donation.create_batch([Donation(
+                user           = pending.user,
+                project_id     = funding_options[option_id].project_id,
+                funding_option = funding_options[option_id]
+            ) for pending in accepted for option_id, quantity in pending.quantities.items() for _ in range(quantity)])
+
+            if donations:
+                donations_created.send(sender=Donation, donations=donations)
+
+donation_batcher = DonationBatcher()
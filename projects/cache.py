@@ -0,0 +1,194 @@
+import uuid
+import hashlib
+from datetime           import datetime
+
+from django.conf        import settings
+from django.core.cache  import caches
+from django.db          import transaction
+from django.db.models   import Min
+
+from .models            import Project, Donation
+from users.models       import Likes
+
+class ProjectListCache:
+    """
+    Shared cache of anonymous ``GET /projects`` payloads.
+
+    Entries are keyed by a generation token plus the normalized filter set. Bumping the
+    generation orphans every cached page at once, which is how donations, likes, project
+    writes and the next launch/end date boundary (when a project's status flips) invalidate
+    the listing without having to know which pages they affect. The boundary itself is only
+    recomputed after a project write commits, or by the one reader that finds it passed.
+
+    Every bump stores a fresh random token rather than incrementing a number, so a
+    generation is never reused: a counter that is evicted or loses a concurrent update
+    cannot bring already cached pages back to life. The generation, boundary and lock live
+    in the ``PROJECT_COUNTER_CACHE`` alias, apart from the pages, so page churn can't cull
+    them.
+    """
+    KEY_PREFIX     = 'projects:list'
+    GENERATION_KEY = f'{KEY_PREFIX}:generation'
+    BOUNDARY_KEY   = f'{KEY_PREFIX}:boundary'
+    LOCK_KEY       = f'{KEY_PREFIX}:lock'
+    LOCK_TIMEOUT   = 30
+    HITS_KEY       = f'{KEY_PREFIX}:hits'
+    MISSES_KEY     = f'{KEY_PREFIX}:misses'
+    TIMEOUT        = 60 * 10
+    PARAMS         = ('progressMin', 'progressMax', 'amountMin', 'amountMax', 'category', 'status',
+                      'liked', 'donated', 'sorted', 'search', 'cursor', 'limit', 'fields')
+
+    def __init__(self, alias = None, counter_alias = None):
+        self.alias         = alias
+        self.counter_alias = counter_alias
+
+    @property
+    def cache(self):
+        return caches[self.alias or getattr(settings, 'PROJECT_LIST_CACHE', 'default')]
+
+    @property
+    def counters(self):
+        return caches[self.counter_alias or getattr(settings, 'PROJECT_COUNTER_CACHE', 'default')]
+
+    def normalize(self, queries):
+        return tuple(sorted((param, queries.get(param)) for param in self.PARAMS if queries.get(param) is not None))
+
+    def digest(self, queries):
+        return hashlib.md5(repr(self.normalize(queries)).encode('utf-8')).hexdigest()
+
+    def key(self, queries):
+        return f'{self.KEY_PREFIX}:{self.generation()}:{self.digest(queries)}'
+
+    def etag(self, queries, user = None):
+        user_version = f'{user.id}.{user_project_overlay.version(user.id)}' if user else '0'
+        return f'{self.generation()}-{self.digest(queries)[:16]}-{user_version}'
+
+    def generation(self):
+        values     = self.counters.get_many([self.GENERATION_KEY, self.BOUNDARY_KEY])
+        generation = values.get(self.GENERATION_KEY)
+        boundary   = values.get(self.BOUNDARY_KEY)
+        now        = datetime.now().timestamp()
+
+        if generation is None or boundary is None or now >= boundary:
+            generation = self.refresh_boundary() or generation or self._bump()
+
+        return generation
+
+    def refresh_boundary(self):
+        if not self.counters.add(self.LOCK_KEY, True, self.LOCK_TIMEOUT):
+            return None
+
+        try:
+            self.counters.set(self.BOUNDARY_KEY, self.next_status_boundary(), None)
+            return self._bump()
+        finally:
+            self.counters.delete(self.LOCK_KEY)
+
+    def next_status_boundary(self):
+        now         = datetime.now()
+        next_launch = Project.objects.filter(launch_date__gt=now).aggregate(boundary=Min('launch_date'))['boundary']
+        next_end    = Project.objects.filter(end_date__gte=now).aggregate(boundary=Min('end_date'))['boundary']
+        boundaries  = [boundary.timestamp() for boundary in (next_launch, next_end) if boundary]
+
+        return min(boundaries, default=float('inf'))
+
+    def get(self, queries):
+        payload = self.cache.get(self.key(queries))
+        self._count(self.MISSES_KEY if payload is None else self.HITS_KEY)
+        return payload
+
+    def set(self, queries, payload):
+        self.cache.set(self.key(queries), payload, self.TIMEOUT)
+
+    def invalidate(self, boundary = False):
+        self._bump()
+        transaction.on_commit(self.refresh_boundary if boundary else self._bump)
+
+    def stats(self):
+        values = self.counters.get_many([self.HITS_KEY, self.MISSES_KEY])
+        return {'hits': values.get(self.HITS_KEY, 0), 'misses': values.get(self.MISSES_KEY, 0)}
+
+    def _bump(self):
+        generation = uuid.uuid4().hex
+        self.counters.set(self.GENERATION_KEY, generation, None)
+        return generation
+
+    def _count(self, key):
+        self.counters.add(key, 0, None)
+
+        try:
+            return self.counters.incr(key)
+        except ValueError:
+            self.counters.set(key, 1, None)
+            return 1
+
+class UserProjectOverlay:
+    """
+    Per-user liked/donated project id sets, laid over shared listing pages so that a
+    logged-in listing costs the same as an anonymous one plus a single cache read. The
+    per-user version that feeds the listing ETag is a random token kept with the listing
+    generation, replaced on every change and never reused.
+    """
+    KEY_PREFIX = 'projects:user'
+    TIMEOUT    = 60 * 30
+
+    def __init__(self, alias = None, counter_alias = None):
+        self.alias         = alias
+        self.counter_alias = counter_alias
+
+    @property
+    def cache(self):
+        return caches[self.alias or getattr(settings, 'PROJECT_LIST_CACHE', 'default')]
+
+    @property
+    def counters(self):
+        return caches[self.counter_alias or getattr(settings, 'PROJECT_COUNTER_CACHE', 'default')]
+
+    def key(self, user_id):
+        return f'{self.KEY_PREFIX}:{user_id}:overlay'
+
+    def version_key(self, user_id):
+        return f'{self.KEY_PREFIX}:{user_id}:version'
+
+    def version(self, user_id):
+        version = uuid.uuid4().hex
+
+        if self.counters.add(self.version_key(user_id), version, None):
+            return version
+
+        return self.counters.get(self.version_key(user_id)) or version
+
+    def get(self, user):
+        overlay = self.cache.get(self.key(user.id))
+
+        if overlay is None:
+            overlay = {
+                'liked'  : set(Likes.objects.filter(user=user).values_list('project_id', flat=True)),
+                'donated': set(Donation.objects.filter(user=user).values_list('project_id', flat=True)),
+            }
+            self.cache.set(self.key(user.id), overlay, self.TIMEOUT)
+
+        return overlay
+
+    def apply(self, user, data):
+        overlay = self.get(user)
+
+        flags   = {
+            'is_liked'  : overlay['liked'],
+            'is_donated': overlay['donated'],
+        }
+
+        return {**data, 'projects': [{
+            **project,
+            **{flag: project['id'] in project_ids for flag, project_ids in flags.items() if flag in project},
+        } for project in data['projects']]}
+
+    def invalidate(self, user_id):
+        self._drop(user_id)
+        transaction.on_commit(lambda: self._drop(user_id))
+
+    def _drop(self, user_id):
+        self.cache.delete(self.key(user_id))
+        self.counters.set(self.version_key(user_id), uuid.uuid4().hex, None)
+
+project_list_cache   = ProjectListCache()
+user_project_overlay = UserProjectOverlay()
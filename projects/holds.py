@@ -0,0 +1,109 @@
+import uuid
+from datetime           import datetime, timedelta
+
+from django.conf        import settings
+from django.core.cache  import caches
+from django.db          import transaction
+from django.db.models   import Q, Min
+
+from .models            import RewardHold
+
+class SoldOutError(Exception):
+    def __init__(self, err_msg = None):
+        super().__init__()
+        self.err_message = err_msg
+
+class HoldContentionError(Exception):
+    def __init__(self, err_msg = None):
+        super().__init__()
+        self.err_message = err_msg
+
+class RewardHoldAllocator:
+    """
+    Short-lived reservations for limited funding options.
+
+    The first claim on an option splits its remaining stock into one ``RewardHold`` slot row
+    per unit. A claim takes any free or expired slot (``SKIP LOCKED`` where the database
+    supports it), so concurrent buyers spread over many rows instead of queueing on the
+    ``funding_options`` row, and an expired hold is back in stock as soon as it expires.
+    When no slot is free the option is flagged sold out in the shared cache until the earliest
+    hold expires, which lets every further claim fail without touching the database. A claim
+    that keeps losing races while free slots remain raises ``HoldContentionError`` instead.
+    """
+    HOLD_SECONDS     = 60 * 5
+    SOLD_OUT_SECONDS = 60
+    MAX_ATTEMPTS     = 5
+    KEY_PREFIX       = 'projects:holds'
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'PROJECT_LIST_CACHE', 'shared')]
+
+    def sold_out_key(self, option_id):
+        return f'{self.KEY_PREFIX}:{option_id}:sold_out'
+
+    def is_sold_out(self, option_id):
+        return bool(self.cache.get(self.sold_out_key(option_id)))
+
+    def has_slots(self, option_id):
+        return RewardHold.objects.filter(funding_option_id=option_id).exists()
+
+    def ensure_slots(self, funding_option):
+        if funding_option.remains > 0 and not self.has_slots(funding_option.id):
+            RewardHold.objects.bulk_create([
+                RewardHold(funding_option_id=funding_option.id, slot=slot) for slot in range(funding_option.remains)
+            ], ignore_conflicts=True)
+
+    def claim(self, user, funding_option):
+        now = datetime.now()
+
+        if self.is_sold_out(funding_option.id):
+            raise SoldOutError("Sold out.")
+
+        held = RewardHold.objects.filter(funding_option=funding_option, user=user, expires_at__gte=now).first()
+
+        if held:
+            return held
+
+        self.ensure_slots(funding_option)
+
+        claimable  = Q(expires_at__isnull=True) | Q(expires_at__lt=now)
+        expires_at = now + timedelta(seconds=self.HOLD_SECONDS)
+        token      = uuid.uuid4().hex
+
+        for _ in range(self.MAX_ATTEMPTS):
+            with transaction.atomic():
+                slot = RewardHold.objects.select_for_update(skip_locked=True)\
+                                         .filter(claimable, funding_option=funding_option)\
+                                         .first()
+
+                if slot is None:
+                    break
+
+                if RewardHold.objects.filter(claimable, id=slot.id).update(user=user, token=token, expires_at=expires_at):
+                    slot.user, slot.token, slot.expires_at = user, token, expires_at
+                    return slot
+
+        if RewardHold.objects.filter(claimable, funding_option=funding_option).exists():
+            raise HoldContentionError("Every free slot was taken by a concurrent claim.")
+
+        self.mark_sold_out(funding_option.id, now)
+        raise SoldOutError("Sold out.")
+
+    def mark_sold_out(self, option_id, now):
+        earliest = RewardHold.objects.filter(funding_option_id=option_id).aggregate(earliest=Min('expires_at'))['earliest']
+        timeout  = max((earliest - now).total_seconds(), 1) if earliest else self.SOLD_OUT_SECONDS
+
+        self.cache.set(self.sold_out_key(option_id), True, min(timeout, self.SOLD_OUT_SECONDS))
+
+    def consume(self, token, user, option_id):
+        deleted, _ = RewardHold.objects.filter(
+            token             = token,
+            user              = user,
+            funding_option_id = option_id,
+            expires_at__gte   = datetime.now()
+        ).delete()
+
+        return bool(deleted)
+
+reward_holds = RewardHoldAllocator()
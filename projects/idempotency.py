@@ -0,0 +1,80 @@
+import hashlib
+import functools
+from datetime       import datetime, timedelta
+
+from django.conf    import settings
+from django.db      import transaction, IntegrityError
+from django.http    import HttpResponse, JsonResponse
+
+from .models        import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+
+def request_fingerprint(request):
+    digest = hashlib.sha256(f'{request.method} {request.path}\n'.encode('utf-8'))
+    digest.update(request.body)
+    return digest.hexdigest()
+
+def replay(record):
+    response = HttpResponse(record.content, status=record.status_code, content_type=record.content_type)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+def idempotent():
+    """
+    Honors the ``Idempotency-Key`` header on a ``login_required`` view.
+
+    The key row is inserted in the same transaction as the view's own writes, so a retry
+    either waits on the unique index until the first attempt commits and then gets its
+    stored response back, or finds nothing because the first attempt rolled back. A replay
+    never runs the view. Keys live for ``IDEMPOTENCY_KEY_SECONDS`` and are removed by the
+    ``purge_idempotency_keys`` command.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper_idempotent(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+
+            if not key:
+                return function(request, *args, **kwargs)
+
+            if len(key) > IdempotencyKey._meta.get_field('key').max_length:
+                return JsonResponse({'messages': 'INVALID_IDEMPOTENCY_KEY'}, status=400)
+
+            now         = datetime.now()
+            fingerprint = request_fingerprint(request)
+
+            with transaction.atomic():
+                IdempotencyKey.objects.filter(user=request.user, key=key, expires_at__lt=now).delete()
+
+                try:
+                    with transaction.atomic():
+                        record = IdempotencyKey.objects.create(
+                            user        = request.user,
+                            key         = key,
+                            fingerprint = fingerprint,
+                            expires_at  = now + timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_SECONDS', 60 * 60 * 24))
+                        )
+                except IntegrityError:
+                    record = IdempotencyKey.objects.get(user=request.user, key=key)
+
+                    if record.fingerprint != fingerprint:
+                        return JsonResponse({'messages': 'IDEMPOTENCY_KEY_REUSED'}, status=422)
+
+                    return replay(record)
+
+                response = function(request, *args, **kwargs)
+
+                if response.status_code >= 500:
+                    transaction.set_rollback(True)
+                    return response
+
+                record.status_code  = response.status_code
+                record.content      = response.content.decode(response.charset)
+                record.content_type = response['Content-Type']
+                record.save(update_fields=['status_code', 'content', 'content_type'])
+
+            return response
+
+        return wrapper_idempotent
+    return decorator
@@ -0,0 +1,202 @@
+from collections        import defaultdict
+from datetime           import datetime
+
+from django.conf        import settings
+from django.core.cache  import caches
+from django.db          import transaction, IntegrityError
+from django.db.models   import Q
+
+from .models            import Project, Category, LeaderboardEntry
+from .cache             import project_list_cache
+
+class Leaderboards:
+    """
+    Precomputed top-``SIZE`` lists of ongoing projects, overall and per category.
+
+    ``amount`` and ``people`` rank by the denormalized ``ProjectStats`` counters, ``ending`` by
+    the closest end date. Donations and project writes queue a ``leaderboards.refresh`` outbox
+    event; the ``drain_outbox`` worker then only touches the rows of the boards the project is
+    on or is about to enter, and recomputes a scope from the indexed columns only when a
+    listed project falls back or stops being eligible. Launch/end boundaries are picked up
+    lazily on read under a shared cache lock; the (board, scope, project) unique constraint
+    turns a rebuild that races another worker's into a no-op.
+    """
+    SIZE         = 10
+    BOARDS       = {
+        'amount': ('stats__funding_amount', True),
+        'people': ('stats__funding_count',  True),
+        'ending': ('end_date',              False),
+    }
+    KEY_PREFIX   = 'projects:leaderboards'
+    BOUNDARY_KEY = f'{KEY_PREFIX}:boundary'
+    LOCK_KEY     = f'{KEY_PREFIX}:lock'
+    LOCK_TIMEOUT = 60
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'PROJECT_LIST_CACHE', 'default')]
+
+    def score(self, board, value):
+        if board == 'ending':
+            return -value.timestamp()
+
+        return float(value or 0)
+
+    def top(self, board, category_id, now):
+        lookup, descending = self.BOARDS[board]
+        projects           = Project.objects.filter_status('ing', now)
+
+        if category_id is not None:
+            projects = projects.filter(category_id=category_id)
+
+        if lookup.startswith('stats__'):
+            projects = projects.filter(stats__isnull=False)
+
+        return [
+            (project_id, self.score(board, value))
+            for project_id, value in projects.order_by(f'-{lookup}' if descending else lookup, 'id')
+                                             .values_list('id', lookup)[:self.SIZE]
+        ]
+
+    def rebuild_scope(self, board, category_id, now):
+        entries = self.top(board, category_id, now)
+
+        scope   = LeaderboardEntry.scope_of(category_id)
+
+        LeaderboardEntry.objects.filter(board=board, scope=scope).delete()
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(board=board, category_id=category_id, scope=scope, project_id=project_id, score=score)
+            for project_id, score in entries
+        ])
+
+        return len(entries)
+
+    def rebuild(self):
+        now          = datetime.now()
+        scopes       = [None, *Category.objects.values_list('id', flat=True)]
+        boundary     = project_list_cache.next_status_boundary()
+        num_entries  = 0
+
+        with transaction.atomic():
+            for board in self.BOARDS:
+                for category_id in scopes:
+                    num_entries += self.rebuild_scope(board, category_id, now)
+
+        self.cache.set(self.BOUNDARY_KEY, boundary, None)
+
+        return num_entries
+
+    def refresh(self, project_id, boards = None):
+        now     = datetime.now()
+        boards  = boards or list(self.BOARDS)
+        project = Project.objects.filter(id=project_id).values_list(
+            'category_id', 'launch_date', 'end_date', 'stats__funding_amount', 'stats__funding_count'
+        ).first()
+
+        if project is None:
+            return
+
+        category_id, launch_date, end_date, funding_amount, funding_count = project
+
+        eligible = launch_date <= now <= end_date
+        values   = {'amount': funding_amount, 'people': funding_count, 'ending': end_date}
+        entries  = defaultdict(dict)
+
+        with transaction.atomic():
+            for board, scope, listed_id, score in LeaderboardEntry.objects.select_for_update()\
+                                                                          .filter(board__in=boards)\
+                                                                          .filter(Q(category_id=category_id) | Q(category__isnull=True))\
+                                                                          .values_list('board', 'category_id', 'project_id', 'score'):
+                entries[(board, scope)][listed_id] = score
+
+            for board in boards:
+                # A project without a stats row yet stays off the stats boards, as in top().
+                listed = eligible and values[board] is not None
+                score  = self.score(board, values[board]) if listed else None
+
+                for scope in (None, category_id):
+                    self.apply(board, scope, project_id, score, entries[(board, scope)], now)
+
+    def apply(self, board, category_id, project_id, score, entries, now):
+        current = entries.get(project_id)
+
+        if score is None or (current is not None and score < current):
+            if current is not None:
+                self.rebuild_scope(board, category_id, now)
+            return
+
+        if current == score:
+            return
+
+        if current is None and len(entries) >= self.SIZE:
+            lowest = min(entries, key=lambda listed_id: (entries[listed_id], -listed_id))
+
+            if (score, -project_id) < (entries[lowest], -lowest):
+                return
+
+            LeaderboardEntry.objects.filter(board=board, scope=LeaderboardEntry.scope_of(category_id), project_id=lowest).delete()
+
+        LeaderboardEntry.objects.update_or_create(
+            board      = board,
+            scope      = LeaderboardEntry.scope_of(category_id),
+            project_id = project_id,
+            defaults   = {'category_id': category_id, 'score': score}
+        )
+
+    def invalidate(self):
+        self.cache.delete(self.BOUNDARY_KEY)
+
+    def check_boundary(self):
+        boundary = self.cache.get(self.BOUNDARY_KEY)
+
+        if boundary is not None and datetime.now().timestamp() < boundary:
+            return
+
+        if not self.cache.add(self.LOCK_KEY, True, self.LOCK_TIMEOUT):
+            return
+
+        try:
+            self.rebuild()
+        except IntegrityError:
+            pass
+        finally:
+            self.cache.delete(self.LOCK_KEY)
+
+    def read(self, category = None, boards = None):
+        self.check_boundary()
+
+        boards  = boards or list(self.BOARDS)
+        entries = LeaderboardEntry.objects.filter(board__in=boards)\
+                                          .select_related('project__category', 'project__stats')\
+                                          .order_by('board', '-score', 'project_id')
+
+        if category:
+            entries = entries.filter(category__name=category)
+        else:
+            entries = entries.filter(scope=LeaderboardEntry.OVERALL)
+
+        result = {board: [] for board in boards}
+
+        for entry in entries:
+            result[entry.board].append(self.serialize(entry.project))
+
+        return result
+
+    def serialize(self, project):
+        stats          = getattr(project, 'stats', None)
+        funding_amount = stats.funding_amount if stats else 0
+        funding_count  = stats.funding_count if stats else 0
+
+        return {
+            'id'             : project.id,
+            'title_image_url': project.title_image_url,
+            'title'          : project.title,
+            'category'       : project.category.name,
+            'funding_amount' : float(funding_amount),
+            'funding_count'  : funding_count,
+            'target_amount'  : float(project.target_fund),
+            'end_date'       : project.end_date,
+            'progress'       : float(100 * funding_amount / project.target_fund) if project.target_fund else None,
+        }
+
+leaderboards = Leaderboards()
@@ -0,0 +1,81 @@
+from django.db          import connection, transaction
+from django.db.models   import F
+
+from .models            import Project, ProjectStats
+from .cache             import project_list_cache, user_project_overlay
+from .outbox            import outbox
+from users.models       import Likes
+from utils.db_router    import pin_to_primary
+
+INSERT_IGNORE = {
+    'sqlite'    : ('INSERT OR IGNORE INTO', ''),
+    'mysql'     : ('INSERT IGNORE INTO', ''),
+    'postgresql': ('INSERT INTO', ' ON CONFLICT DO NOTHING'),
+}
+
+class ProjectLikes:
+    """
+    Like/unlike as single statements backed by the ``likes`` (user, project) unique constraint.
+
+    ``like`` is one ``INSERT ... SELECT`` from ``projects`` that the database ignores when the
+    row already exists, ``unlike`` one ``DELETE``. Both report whether they changed anything,
+    so repeated or concurrent taps are no-ops instead of duplicate rows or integrity errors,
+    and ``Project.like_count``, caches, the project version and the outbox are only touched
+    on an actual change. The project is looked up only when nothing changed, to tell an
+    unknown project apart.
+    """
+    def like(self, user, project_id):
+        prefix, suffix = INSERT_IGNORE[connection.vendor]
+        likes          = connection.ops.quote_name(Likes._meta.db_table)
+        projects       = connection.ops.quote_name(Project._meta.db_table)
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'{prefix} {likes} (user_id, project_id) SELECT %s, id FROM {projects} WHERE id = %s{suffix}',
+                    [user.id, project_id]
+                )
+                changed = cursor.rowcount > 0
+
+            self.check(changed, project_id)
+
+            if changed:
+                self.changed(user, project_id, True)
+
+        return changed
+
+    def unlike(self, user, project_id):
+        with transaction.atomic():
+            changed = Likes.objects.filter(user=user, project_id=project_id).delete()[0] > 0
+
+            self.check(changed, project_id)
+
+            if changed:
+                self.changed(user, project_id, False)
+
+        return changed
+
+    def toggle(self, user, project_id):
+        if self.unlike(user, project_id):
+            return False
+
+        self.like(user, project_id)
+        return True
+
+    def check(self, changed, project_id):
+        if not changed and not Project.objects.filter(id=project_id).exists():
+            raise Project.DoesNotExist
+
+    def changed(self, user, project_id, is_liked):
+        if is_liked:
+            Project.objects.filter(id=project_id).update(like_count=F('like_count') + 1)
+        else:
+            Project.objects.filter(id=project_id, like_count__gt=0).update(like_count=F('like_count') - 1)
+
+        ProjectStats.bump_version(project_id)
+        pin_to_primary(user.id)
+        project_list_cache.invalidate()
+        user_project_overlay.invalidate(user.id)
+        outbox.publish('like.created' if is_liked else 'like.deleted', [{'project_id': project_id, 'user_id': user.id}])
+
+project_likes = ProjectLikes()
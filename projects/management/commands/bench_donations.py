@@ -0,0 +1,116 @@
+import time
+import random
+from collections                    import Counter
+from concurrent.futures             import ThreadPoolExecutor
+from datetime                       import datetime, timedelta
+
+from django.core.management.base    import BaseCommand, CommandError
+from django.db                      import connections, router, OperationalError
+from django.test                    import RequestFactory, override_settings
+
+from users.models                   import User
+from projects.models                import Project, Category, FundingOption, Donation
+from projects.views                 import ProjectDetailView
+from utils.auth                     import issue_token
+
+class Command(BaseCommand):
+    help = "Benchmark donation requests per second: one transaction per request vs group commit"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=32)
+        parser.add_argument('--retries', type=int, default=50, help="Attempts per request while the database is locked")
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write(self.style.NOTICE("Start Benchmarking Donations"))
+            self.stdout.write(f"insert path: {self.insert_path()}")
+
+            for batching in (False, True):
+                with override_settings(DONATION_BATCHING=batching):
+                    project, option, token = self.populate(options['requests'])
+
+                    try:
+                        elapsed, status_codes = self.measure(project, option, token, options['requests'], options['threads'], options['retries'])
+                        num_inserts           = Donation.objects.filter(project=project).values('batch').distinct().count()
+                    finally:
+                        self.cleanup(project)
+
+                self.stdout.write(
+                    f"{'group commit' if batching else 'per request':>12} | {options['requests'] / elapsed:8.1f} req/s | "
+                    f"{status_codes.count(201)} SUCCESS | {status_codes.count(400)} NO_STOCK | "
+                    f"{len(status_codes) - status_codes.count(201) - status_codes.count(400)} errors | "
+                    f"{num_inserts} donation INSERTs"
+                )
+
+                for error, count in Counter(code for code in status_codes if code not in (201, 400)).items():
+                    self.stderr.write(f"{'':>12} | {count} x {error}")
+
+            self.stdout.write(self.style.SUCCESS("Donation Benchmark Finished."))
+
+        except CommandError as e:
+            print(e)
+
+    def insert_path(self):
+        features = connections[router.db_for_write(Donation)].features
+
+        if features.can_return_rows_from_bulk_insert:
+            return "one multi-row INSERT ... RETURNING per batch"
+
+        return "one multi-row INSERT plus one SELECT of the new ids per batch"
+
+    def populate(self, num_requests):
+        now     = datetime.now()
+        creater = User.objects.create(username='bench', email='bench@tteokbok.com', password='bench')
+        project = Project.objects.create(
+            title           = '벤치마크',
+            creater         = creater,
+            summary         = '벤치마크 프로젝트',
+            category        = Category.objects.get_or_create(name='bench')[0],
+            title_image_url = 'https://tteokbok.com/image.jpg',
+            target_fund     = 100000,
+            launch_date     = now - timedelta(days=1),
+            end_date        = now + timedelta(days=30),
+        )
+        option  = FundingOption.objects.create(
+            amount      = 1000,
+            project     = project,
+            remains     = num_requests // 2,
+            title       = '벤치마크',
+            description = '절반만 성공',
+        )
+
+        return project, option, issue_token(creater)
+
+    def measure(self, project, option, token, num_requests, num_threads, retries):
+        view = ProjectDetailView.as_view()
+
+        def donate(_):
+            request = RequestFactory().put(
+                f'/projects/{project.id}', {'option_id': option.id},
+                HTTP_AUTHORIZATION=token, content_type='application/json'
+            )
+
+            try:
+                for attempt in range(retries):
+                    try:
+                        return view(request, id=project.id).status_code
+                    except OperationalError:
+                        time.sleep(random.uniform(0, min(0.001 * 2 ** attempt, 0.1)))
+
+                return 'OperationalError'
+            except Exception as e:
+                return type(e).__name__
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            status_codes = list(executor.map(donate, range(num_requests)))
+
+        return time.perf_counter() - started, status_codes
+
+    def cleanup(self, project):
+        Donation.objects.filter(project=project).delete()
+        project.creater.delete()
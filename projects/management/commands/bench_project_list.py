@@ -0,0 +1,99 @@
+import time
+from datetime                       import datetime, timedelta
+from decimal                        import Decimal
+
+from django.core.management.base    import BaseCommand
+from django.db                      import transaction
+from django.db.models               import F, Value, When, Case
+from django.db.models.functions     import Coalesce
+
+from users.models                   import User
+from projects.models                import Project, Category
+from projects.views                 import ProjectView
+from utils.serializers              import ValuesListSerializer
+
+class Rollback(Exception):
+    pass
+
+class Command(BaseCommand):
+    help = "Benchmark the project listing serialization: model instances vs values_list rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', nargs='+', type=int, default=[1000, 10000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        for num_rows in options['rows']:
+            try:
+                with transaction.atomic():
+                    self.populate(num_rows)
+                    instance_time = self.measure(self.serialize_instances, options['repeat'])
+                    values_time   = self.measure(self.serialize_values, options['repeat'])
+                    raise Rollback
+            except Rollback:
+                pass
+
+            self.stdout.write(
+                f"{num_rows:>6} rows | instances {instance_time * 1000:8.1f} ms | "
+                f"values_list {values_time * 1000:8.1f} ms | x{instance_time / values_time:.2f}"
+            )
+
+    def populate(self, num_rows):
+        now      = datetime.now()
+        creater  = User.objects.create(username='bench', email='bench@tteokbok.com', password='bench')
+        category = Category.objects.create(name='bench')
+
+        Project.objects.bulk_create([Project(
+            title           = f'프로젝트 {i}',
+            creater         = creater,
+            summary         = '프로젝트 설명' * 10,
+            category        = category,
+            title_image_url = 'https://tteokbok.com/image.jpg',
+            target_fund     = 100000,
+            launch_date     = now - timedelta(days=i % 30),
+            end_date        = now + timedelta(days=i % 60 - 15),
+        ) for i in range(num_rows)], batch_size=1000)
+
+    def measure(self, serialize, repeat):
+        best = float('inf')
+
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serialize(self.queryset())
+            best    = min(best, time.perf_counter() - started)
+
+        return best
+
+    def queryset(self):
+        now = datetime.now()
+
+        return Project.objects.annotate(funding_amount = Coalesce(F('stats__funding_amount'), Decimal(0)))\
+                              .annotate(funding_count = Coalesce(F('stats__funding_count'), 0))\
+                              .annotate(progress = 100 * F('funding_amount')/F('target_fund'))\
+                              .annotate(status = Case(When(end_date__lt = now, then=Value("done")),
+                                                      When(launch_date__gt = now, then=Value("scheduled")),
+                                                      default=Value("ing")))\
+                              .order_by('-created_at', '-id')
+
+    def serialize_instances(self, project_list):
+        return [{
+            'id'             : project.id,
+            'title_image_url': project.title_image_url,
+            'title'          : project.title,
+            'category'       : project.category.name,
+            'creater'        : project.creater.username,
+            'summary'        : project.summary,
+            'funding_amount' : float(project.funding_amount),
+            'funding_count'  : project.funding_count,
+            'target_amount'  : float(project.target_fund),
+            'launch_date'    : project.launch_date,
+            'end_date'       : project.end_date,
+            'status'         : project.status,
+            'progress'       : project.progress,
+            'is_liked'       : False,
+            'is_donated'     : False,
+        } for project in project_list.select_related('category', 'creater')]
+
+    def serialize_values(self, project_list):
+        serializer = ValuesListSerializer(ProjectView.LIST_FIELDS, list(ProjectView.LIST_FIELDS))
+        return serializer.serialize(project_list.values_list(*serializer.lookups))
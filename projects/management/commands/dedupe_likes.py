@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from projects.models import Project
+from users.models    import Likes
+
+class Command(BaseCommand):
+    help = "Remove duplicate (user, project) likes ahead of the likes_user_project_unique constraint"
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.NOTICE("Start Removing Duplicate Likes"))
+        num_likes    = Likes.remove_duplicates()
+        num_projects = Project.rebuild_like_counts()
+        self.stdout.write(self.style.SUCCESS(f"{num_likes} Duplicate Likes Removed, Like Counts Repaired for {num_projects} Projects."))
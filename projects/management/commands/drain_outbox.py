@@ -0,0 +1,51 @@
+import time
+from datetime                       import datetime, timedelta
+
+from django.core.management.base    import BaseCommand, CommandError
+
+from projects.outbox                import outbox
+
+class Command(BaseCommand):
+    help           = "Deliver pending outbox events to their handlers"
+    PURGE_INTERVAL = 60 * 60
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--interval', type=float, default=1.0)
+        parser.add_argument('--keep-days', type=int, default=7)
+        parser.add_argument('--once', action='store_true', help="Exit once no event is pending instead of polling")
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write(self.style.NOTICE("Start Draining Outbox"))
+            num_processed = 0
+            num_failed    = 0
+            num_purged    = 0
+            purged_at     = None
+
+            try:
+                while True:
+                    processed, failed = outbox.drain(options['batch_size'])
+                    num_processed    += processed
+                    num_failed       += failed
+
+                    if processed + failed == options['batch_size']:
+                        continue
+
+                    if purged_at is None or time.monotonic() - purged_at >= self.PURGE_INTERVAL:
+                        num_purged += outbox.purge(datetime.now() - timedelta(days=options['keep_days']))
+                        purged_at   = time.monotonic()
+
+                    if options['once']:
+                        break
+
+                    time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                pass
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{num_processed} Outbox Events Processed, {num_failed} Failed, {num_purged} Purged."
+            ))
+
+        except CommandError as e:
+            print(e)
@@ -0,0 +1,30 @@
+from datetime                       import datetime
+
+from django.core.management.base    import BaseCommand, CommandError
+
+from projects.models                import IdempotencyKey
+
+class Command(BaseCommand):
+    help = "Delete expired donation idempotency keys"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write(self.style.NOTICE("Start Purging Idempotency Keys"))
+            now        = datetime.now()
+            num_purged = 0
+
+            while True:
+                expired = list(IdempotencyKey.objects.filter(expires_at__lt=now).values_list('id', flat=True)[:options['batch_size']])
+
+                if not expired:
+                    break
+
+                num_purged += IdempotencyKey.objects.filter(id__in=expired).delete()[0]
+
+            self.stdout.write(self.style.SUCCESS(f"{num_purged} Idempotency Keys Purged."))
+
+        except CommandError as e:
+            print(e)
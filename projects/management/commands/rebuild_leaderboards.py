@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.leaderboards import leaderboards
+
+class Command(BaseCommand):
+    help = "Recompute the top funded, most backed and ending soon leaderboards for every category"
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write(self.style.NOTICE("Start Rebuilding Leaderboards"))
+            num_entries = leaderboards.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Leaderboards Rebuilt with {num_entries} Entries."))
+
+        except CommandError as e:
+            print(e)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from projects.models import Project
+
+class Command(BaseCommand):
+    help = "Reconcile the denormalized per-project like counts with the likes table"
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.NOTICE("Start Rebuilding Like Counts"))
+        num_projects = Project.rebuild_like_counts()
+        self.stdout.write(self.style.SUCCESS(f"Like Counts Repaired for {num_projects} Projects."))
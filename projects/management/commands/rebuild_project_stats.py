@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import ProjectStats
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized per-project funding statistics from donations"
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write(self.style.NOTICE("Start Rebuilding Project Stats"))
+            num_projects = ProjectStats.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Project Stats Rebuilt for {num_projects} Projects."))
+
+        except CommandError as e:
+            print(e)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.search import rebuild_index
+
+class Command(BaseCommand):
+    help = "Rebuild project search documents and the search backend index"
+
+    def handle(self, *args, **options):
+        try:
+            self.stdout.write(self.style.NOTICE("Start Rebuilding Search Index"))
+            num_projects = rebuild_index()
+            self.stdout.write(self.style.SUCCESS(f"Search Index Rebuilt for {num_projects} Projects."))
+
+        except CommandError as e:
+            print(e)
@@ -1,4 +1,24 @@
-from django.db import models
+import uuid
+from collections                    import defaultdict
+from datetime                       import datetime
+from decimal                        import Decimal
+
+from django.db                      import models, transaction, router
+from django.db.models               import F, Q, Sum, Count, Max, OuterRef, Subquery
+from django.db.models.functions     import Coalesce
+
+from users.models                   import Likes
+
+class ProjectQuerySet(models.QuerySet):
+    def filter_status(self, status, now=None):
+        now        = now or datetime.now()
+        predicates = {
+            'done'     : Q(end_date__lt=now),
+            'scheduled': Q(end_date__gte=now, launch_date__gt=now),
+            'ing'      : Q(end_date__gte=now, launch_date__lte=now),
+        }
+
+        return self.filter(predicates[status]) if status in predicates else self.none()
 
 class Project(models.Model):
     title                = models.CharField(max_length=100)
@@ -10,14 +30,44 @@ class Project(models.Model):
     launch_date          = models.DateTimeField()
     end_date             = models.DateTimeField()
     created_at           = models.DateTimeField(auto_now_add=True)
+    like_count           = models.PositiveIntegerField(default=0)
     tag                  = models.ManyToManyField("Tag", through="ProjectTag")
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         db_table = "projects"
+        indexes  = [
+            models.Index(fields=["category", "created_at"]),
+            models.Index(fields=["created_at"]),
+            models.Index(fields=["end_date", "launch_date"]),
+            models.Index(fields=["launch_date"]),
+            models.Index(fields=["like_count"]),
+        ]
     
     def __str__(self):
         return self.title
 
+    @classmethod
+    def rebuild_like_counts(cls):
+        """
+        Reset ``like_count`` to the number of ``likes`` rows for every project where the two
+        drifted apart, e.g. after likes were removed by a user deletion cascade. Each count is
+        recomputed inside the UPDATE itself, so a like that lands meanwhile is not lost.
+        """
+        drifted = list(cls.objects.annotate(num_likes=Count('likes'))
+                                  .exclude(like_count=F('num_likes'))
+                                  .values_list('id', flat=True))
+        counts  = Likes.objects.filter(project_id=OuterRef('id'))\
+                               .order_by()\
+                               .values('project_id')\
+                               .annotate(count=Count('id'))\
+                               .values('count')
+
+        cls.objects.filter(id__in=drifted).update(like_count=Coalesce(Subquery(counts), 0))
+
+        return len(drifted)
+
 class ProjectTag(models.Model):
     project = models.ForeignKey("Project", on_delete=models.CASCADE)
     tag     = models.ForeignKey("Tag", on_delete=models.CASCADE)
@@ -51,8 +101,197 @@ class Donation(models.Model):
     user           = models.ForeignKey("users.User", on_delete=models.CASCADE)
     project        = models.ForeignKey("Project", on_delete=models.CASCADE)
     funding_option = models.ForeignKey("FundingOption", on_delete=models.CASCADE)
+    batch          = models.UUIDField(null=True)
     created_at     = models.DateTimeField(auto_now_add=True)
     updated_at     = models.DateTimeField(auto_now=True)
 
     class Meta:
-        db_table = "donations"
\ No newline at end of file
+        db_table = "donations"
+        indexes  = [
+            models.Index(fields=["project", "funding_option"]),
+            models.Index(fields=["batch"]),
+        ]
+
+    @classmethod
+    def create_batch(cls, donations):
+        """
+        Insert ``donations`` with a single ``bulk_create`` and return them with their primary
+        keys set, for ``donations_created`` receivers that keep a reference to each donation.
+        Backends that can't return keys from a bulk insert (MySQL, SQLite) get them back with
+        one SELECT on the batch id the rows were tagged with, in insertion order.
+        """
+        batch    = uuid.uuid4()
+        database = router.db_for_write(cls)
+
+        for donation in donations:
+            donation.batch = batch
+
+        cls.objects.using(database).bulk_create(donations)
+
+        if donations and donations[0].pk is None:
+            ids = cls.objects.using(database).filter(batch=batch).order_by('id').values_list('id', flat=True)
+
+            for donation, id in zip(donations, ids):
+                donation.id = id
+
+        return donations
+
+class ProjectSearchDocument(models.Model):
+    project  = models.OneToOneField("Project", on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    document = models.TextField()
+
+    class Meta:
+        db_table = "project_search_documents"
+
+class ProjectStats(models.Model):
+    project         = models.OneToOneField("Project", on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    funding_amount  = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    funding_count   = models.PositiveIntegerField(default=0)
+    last_donated_at = models.DateTimeField(null=True)
+    version         = models.PositiveIntegerField(default=0)
+    updated_at      = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = "project_stats"
+        indexes  = [
+            models.Index(fields=["funding_amount", "project"]),
+            models.Index(fields=["funding_count", "project"]),
+        ]
+
+    @classmethod
+    def donation_totals(cls, donations):
+        """
+        Per-project totals of ``donations`` as JSON payloads for the ``stats.donations`` outbox
+        event, so the request only inserts an event row instead of updating the project's
+        stats row, which every donation to a hot project would otherwise queue behind.
+        """
+        totals = defaultdict(lambda: {'amount': Decimal(0), 'count': 0, 'last_donated_at': None})
+
+        for donation in donations:
+            total = totals[donation.project_id]
+            total['amount']         += donation.funding_option.amount
+            total['count']          += 1
+            total['last_donated_at'] = max(filter(None, [total['last_donated_at'], donation.created_at]), default=None)
+
+        return [{
+            'project_id'     : project_id,
+            'amount'         : str(total['amount']),
+            'count'          : total['count'],
+            'last_donated_at': total['last_donated_at'] and total['last_donated_at'].isoformat(),
+        } for project_id, total in sorted(totals.items())]
+
+    @classmethod
+    def record_totals(cls, project_id, amount, count, last_donated_at):
+        updated = cls.objects.filter(project_id=project_id).update(
+            funding_amount  = F('funding_amount') + Decimal(amount),
+            funding_count   = F('funding_count') + count,
+            last_donated_at = last_donated_at and datetime.fromisoformat(last_donated_at),
+            version         = F('version') + 1,
+            updated_at      = datetime.now()
+        )
+
+        if not updated:
+            cls.rebuild(project_ids=[project_id])
+
+    @classmethod
+    def bump_version(cls, project_id):
+        cls.objects.filter(project_id=project_id).update(version=F('version') + 1, updated_at=datetime.now())
+
+    @classmethod
+    def bump_creator_versions(cls, user_id):
+        return cls.objects.filter(project__creater_id=user_id).update(version=F('version') + 1, updated_at=datetime.now())
+
+    @classmethod
+    def rebuild(cls, project_ids=None):
+        projects = Project.objects.all() if project_ids is None else Project.objects.filter(id__in=project_ids)
+        rows     = projects.annotate(amount          = Coalesce(Sum('donation__funding_option__amount'), Decimal(0)))\
+                           .annotate(count           = Count('donation'))\
+                           .annotate(last_donated_at = Max('donation__created_at'))\
+                           .values_list('id', 'amount', 'count', 'last_donated_at')
+
+        with transaction.atomic():
+            versions = dict(cls.objects.filter(project_id__in=projects.values('id')).values_list('project_id', 'version'))
+            stats    = [cls(
+                project_id      = project_id,
+                funding_amount  = amount,
+                funding_count   = count,
+                last_donated_at = last_donated_at,
+                version         = versions.get(project_id, 0) + 1,
+                updated_at      = datetime.now()
+            ) for project_id, amount, count, last_donated_at in rows]
+
+            cls.objects.filter(project_id__in=versions).delete()
+            cls.objects.bulk_create(stats)
+
+        return len(stats)
+
+class LeaderboardEntry(models.Model):
+    OVERALL  = 0
+
+    board    = models.CharField(max_length=16)
+    category = models.ForeignKey("Category", on_delete=models.CASCADE, null=True)
+    scope    = models.PositiveIntegerField()
+    project  = models.ForeignKey("Project", on_delete=models.CASCADE)
+    score    = models.FloatField()
+
+    class Meta:
+        db_table    = "leaderboard_entries"
+        indexes     = [
+            models.Index(fields=["board", "scope", "score"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["board", "scope", "project"], name="leaderboard_board_scope_project_unique"),
+        ]
+
+    @classmethod
+    def scope_of(cls, category_id):
+        return cls.OVERALL if category_id is None else category_id
+
+class RewardHold(models.Model):
+    funding_option = models.ForeignKey("FundingOption", on_delete=models.CASCADE)
+    slot           = models.PositiveIntegerField()
+    user           = models.ForeignKey("users.User", on_delete=models.CASCADE, null=True)
+    token          = models.CharField(max_length=32, null=True, unique=True)
+    expires_at     = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table    = "reward_holds"
+        indexes     = [
+            models.Index(fields=["funding_option", "expires_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["funding_option", "slot"], name="reward_holds_option_slot_unique"),
+        ]
+
+class IdempotencyKey(models.Model):
+    user         = models.ForeignKey("users.User", on_delete=models.CASCADE)
+    key          = models.CharField(max_length=255)
+    fingerprint  = models.CharField(max_length=64)
+    status_code  = models.PositiveSmallIntegerField(null=True)
+    content      = models.TextField(default='')
+    content_type = models.CharField(max_length=100, default='')
+    created_at   = models.DateTimeField(auto_now_add=True)
+    expires_at   = models.DateTimeField()
+
+    class Meta:
+        db_table    = "idempotency_keys"
+        indexes     = [
+            models.Index(fields=["expires_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="idempotency_keys_user_key_unique"),
+        ]
+
+class OutboxEvent(models.Model):
+    topic        = models.CharField(max_length=100)
+    payload      = models.JSONField()
+    attempts     = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=datetime.now)
+    processed_at = models.DateTimeField(null=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "outbox_events"
+        indexes  = [
+            models.Index(fields=["processed_at", "available_at"]),
+        ]
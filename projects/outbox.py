@@ -0,0 +1,81 @@
+import logging
+from collections        import defaultdict
+from datetime           import datetime, timedelta
+
+from django.db          import transaction
+
+from .models            import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+class Outbox:
+    """
+    Transactional outbox for side effects of donations and likes.
+
+    ``publish`` writes one ``OutboxEvent`` row per payload in the caller's transaction with a
+    single INSERT, however many handlers are registered for the topic, so the event exists
+    exactly when the write that caused it commits. The ``drain_outbox`` worker hands pending
+    events to the handlers registered with ``handler`` and marks them processed in the same
+    transaction. Delivery is at least once: a worker that dies before committing leaves its
+    events pending, so handlers must be idempotent. A failing event is retried with an
+    exponential backoff without holding back the rest of the batch.
+    """
+    RETRY_SECONDS     = 30
+    MAX_RETRY_SECONDS = 60 * 60
+
+    def __init__(self):
+        self.handlers = defaultdict(list)
+
+    def handler(self, topic):
+        def decorator(func):
+            self.handlers[topic].append(func)
+            return func
+        return decorator
+
+    def publish(self, topic, payloads):
+        return OutboxEvent.objects.bulk_create([OutboxEvent(topic=topic, payload=payload) for payload in payloads])
+
+    def retry_at(self, event, now):
+        return now + timedelta(seconds=min(self.RETRY_SECONDS * 2 ** (event.attempts - 1), self.MAX_RETRY_SECONDS))
+
+    def drain(self, batch_size = 100):
+        now       = datetime.now()
+        processed = 0
+        failed    = 0
+
+        with transaction.atomic():
+            events = list(OutboxEvent.objects.select_for_update(skip_locked=True)
+                                             .filter(processed_at__isnull=True, available_at__lte=now)
+                                             .order_by('id')[:batch_size])
+
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        for handler in self.handlers.get(event.topic, ()):
+                            handler(event.payload)
+                except Exception:
+                    logger.exception('Outbox event %s (%s) failed', event.id, event.topic)
+
+                    event.attempts    += 1
+                    event.available_at = self.retry_at(event, now)
+                    failed            += 1
+                else:
+                    event.processed_at = now
+                    processed         += 1
+
+            OutboxEvent.objects.bulk_update(events, ['attempts', 'available_at', 'processed_at'])
+
+        return processed, failed
+
+    def purge(self, before, batch_size = 1000):
+        num_purged = 0
+
+        while True:
+            expired = list(OutboxEvent.objects.filter(processed_at__lt=before).values_list('id', flat=True)[:batch_size])
+
+            if not expired:
+                return num_purged
+
+            num_purged += OutboxEvent.objects.filter(id__in=expired).delete()[0]
+
+outbox = Outbox()
@@ -0,0 +1,231 @@
+import re
+import math
+import threading
+from collections                    import Counter, defaultdict
+
+from django.conf                    import settings
+from django.db                      import connection, transaction
+from django.db.models               import Q, Case, When, Value, FloatField
+from django.db.models.expressions   import RawSQL
+from django.utils.module_loading    import import_string
+
+from .models                        import Project, ProjectTag, ProjectSearchDocument
+
+WORD_PATTERN = re.compile(r'\w+')
+
+def tokenize(text):
+    """
+    Split ``text`` into character bigrams per word, which is how the MySQL ngram parser
+    (ngram_token_size=2) indexes Korean text that has no reliable word boundaries.
+    """
+    tokens = []
+
+    for word in WORD_PATTERN.findall(text.lower()):
+        if len(word) < 2:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+
+    return tokens
+
+def build_documents(project_ids):
+    tag_names = defaultdict(list)
+
+    for project_id, tag_name in ProjectTag.objects.filter(project_id__in=project_ids).values_list('project_id', 'tag__name'):
+        tag_names[project_id].append(tag_name)
+
+    return {
+        project_id: ' '.join([title, summary, *tag_names[project_id]])
+        for project_id, title, summary in Project.objects.filter(id__in=project_ids).values_list('id', 'title', 'summary')
+    }
+
+def index_projects(project_ids):
+    documents = build_documents(project_ids)
+
+    with transaction.atomic():
+        ProjectSearchDocument.objects.filter(project_id__in=project_ids).delete()
+        ProjectSearchDocument.objects.bulk_create([
+            ProjectSearchDocument(project_id=project_id, document=document) for project_id, document in documents.items()
+        ])
+
+    transaction.on_commit(lambda: get_backend().index(documents))
+
+def remove_project(project_id):
+    transaction.on_commit(lambda: get_backend().remove(project_id))
+
+def search_projects(project_list, query):
+    """
+    Restrict ``project_list`` to the projects matching ``query`` and annotate ``search_rank``.
+
+    The match is a filter on the queryset, so status/category filters and pagination see
+    every match. A query with a word shorter than one bigram cannot match the index and falls
+    back to the ``LIKE`` search on title and summary.
+    """
+    words = WORD_PATTERN.findall(query)
+
+    if not words or min(len(word) for word in words) < 2:
+        return project_list.filter(Q(title__contains=query) | Q(summary__contains=query))\
+                           .annotate(search_rank = Value(0.0, output_field=FloatField()))
+
+    return get_backend().filter(project_list, query)
+
+def rebuild_index():
+    project_ids = list(Project.objects.values_list('id', flat=True))
+    index_projects(project_ids)
+    get_backend().rebuild()
+
+    return len(project_ids)
+
+class InvertedIndexBackend:
+    """
+    In-process inverted index over the stored search documents.
+
+    Meant for development and the SQLite test settings: each process keeps its own copy,
+    built lazily on the first search and kept current by the project signal handlers once
+    their transaction commits.
+    """
+    def __init__(self):
+        self.lock     = threading.Lock()
+        self.postings = None
+        self.lengths  = {}
+
+    def rebuild(self):
+        with self.lock:
+            self.postings = defaultdict(dict)
+            self.lengths  = {}
+
+            for project_id, document in ProjectSearchDocument.objects.values_list('project_id', 'document'):
+                self._add(project_id, document)
+
+    def index(self, documents):
+        with self.lock:
+            if self.postings is None:
+                return
+
+            for project_id, document in documents.items():
+                self._remove(project_id)
+                self._add(project_id, document)
+
+    def remove(self, project_id):
+        with self.lock:
+            if self.postings is not None:
+                self._remove(project_id)
+
+    def search(self, query, limit = None):
+        if self.postings is None:
+            self.rebuild()
+
+        tokens = set(tokenize(query))
+
+        if not tokens:
+            return []
+
+        with self.lock:
+            postings   = [self.postings.get(token, {}) for token in tokens]
+            candidates = set.intersection(*(set(posting) for posting in postings))
+            scores     = {
+                project_id: sum(
+                    posting[project_id] * math.log(1 + len(self.lengths) / len(posting)) for posting in postings
+                ) / math.sqrt(self.lengths[project_id])
+                for project_id in candidates
+            }
+
+        return sorted(scores.items(), key=lambda item: (-item[1], -item[0]))[:limit]
+
+    def filter(self, project_list, query):
+        search_ranks = self.search(query)
+
+        return project_list.filter(id__in=[project_id for project_id, _ in search_ranks])\
+                           .annotate(search_rank = Case(*[When(id=project_id, then=Value(rank)) for project_id, rank in search_ranks],
+                                                        default=Value(0.0), output_field=FloatField()))
+
+    def _add(self, project_id, document):
+        tokens = Counter(tokenize(document))
+
+        for token, count in tokens.items():
+            self.postings[token][project_id] = count
+
+        self.lengths[project_id] = max(sum(tokens.values()), 1)
+
+    def _remove(self, project_id):
+        if self.lengths.pop(project_id, None) is None:
+            return
+
+        for token in [token for token, posting in self.postings.items() if posting.pop(project_id, None) and not posting]:
+            del self.postings[token]
+
+class MySQLFulltextBackend:
+    """
+    Searches ``project_search_documents`` through its FULLTEXT index built WITH PARSER ngram.
+    The index itself is created by the ``rebuild_search_index`` management command.
+    """
+    INDEX_NAME = 'project_search_documents_ngram'
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+                [ProjectSearchDocument._meta.db_table, self.INDEX_NAME]
+            )
+
+            if not cursor.fetchone()[0]:
+                cursor.execute(
+                    f"ALTER TABLE {ProjectSearchDocument._meta.db_table} "
+                    f"ADD FULLTEXT INDEX {self.INDEX_NAME} (document) WITH PARSER ngram"
+                )
+
+    def index(self, documents):
+        pass
+
+    def remove(self, project_id):
+        pass
+
+    def against(self, query):
+        return ' '.join(f'+"{word}"' for word in WORD_PATTERN.findall(query))
+
+    def search(self, query, limit = None):
+        if not WORD_PATTERN.search(query):
+            return []
+
+        against = self.against(query)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT project_id, MATCH(document) AGAINST(%s IN BOOLEAN MODE) AS score "
+                f"FROM {ProjectSearchDocument._meta.db_table} "
+                f"WHERE MATCH(document) AGAINST(%s IN BOOLEAN MODE) "
+                f"ORDER BY score DESC, project_id DESC" + (" LIMIT %s" if limit else ""),
+                [against, against, *([limit] if limit else [])]
+            )
+
+            return [(project_id, float(score)) for project_id, score in cursor.fetchall()]
+
+    def filter(self, project_list, query):
+        against   = self.against(query)
+        documents = ProjectSearchDocument._meta.db_table
+        projects  = Project._meta.db_table
+
+        return project_list.filter(id__in=RawSQL(
+            f"SELECT project_id FROM {documents} WHERE MATCH(document) AGAINST(%s IN BOOLEAN MODE)", [against]
+        )).annotate(search_rank = RawSQL(
+            f"SELECT MATCH(document) AGAINST(%s IN BOOLEAN MODE) FROM {documents} WHERE {documents}.project_id = {projects}.id",
+            [against], output_field=FloatField()
+        ))
+
+_backend = None
+
+def get_backend():
+    global _backend
+
+    if _backend is None:
+        backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+
+        if backend_path:
+            _backend = import_string(backend_path)()
+        elif connection.vendor == 'mysql':
+            _backend = MySQLFulltextBackend()
+        else:
+            _backend = InvertedIndexBackend()
+
+    return _backend
@@ -0,0 +1,106 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch          import receiver, Signal
+
+from .models                  import Project, Donation, FundingOption, ProjectStats
+from .search                  import index_projects, remove_project
+from .cache                   import project_list_cache, user_project_overlay
+from .leaderboards            import leaderboards
+from .outbox                  import outbox
+from users.models             import User
+from utils.db_router          import pin_to_primary
+
+# Sent with ``donations`` (a list of saved Donation rows) for every batch of new donations.
+# A single Donation.save() is forwarded here as a batch of one; Donation.create_batch callers
+# send it themselves, once for the whole batch.
+donations_created = Signal()
+
+@receiver(post_save, sender=Project)
+def create_project_stats(sender, instance, created, **kwargs):
+    if created:
+        ProjectStats.objects.get_or_create(project=instance)
+    else:
+        ProjectStats.bump_version(instance.id)
+
+@receiver(post_save, sender=FundingOption)
+def bump_project_version(sender, instance, **kwargs):
+    ProjectStats.bump_version(instance.project_id)
+
+# Project detail and listing rows embed the creator's username, introduction and profile image.
+@receiver(post_save, sender=User)
+def bump_creator_project_versions(sender, instance, created, **kwargs):
+    if not created and ProjectStats.bump_creator_versions(instance.id):
+        project_list_cache.invalidate()
+
+@receiver(post_save, sender=Donation)
+def forward_created_donation(sender, instance, created, **kwargs):
+    if created:
+        donations_created.send(sender=Donation, donations=[instance])
+
+@receiver(donations_created)
+def queue_donation_stats(sender, donations, **kwargs):
+    outbox.publish('stats.donations', ProjectStats.donation_totals(donations))
+
+# Applied by the outbox worker in the transaction that marks the event processed, so each
+# event is counted exactly once. Published before the leaderboard refresh of the same
+# donations, which therefore reads the updated totals.
+@outbox.handler('stats.donations')
+def record_donation_stats(payload):
+    ProjectStats.record_totals(**payload)
+    project_list_cache.invalidate()
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, **kwargs):
+    index_projects([instance.id])
+
+@receiver(m2m_changed, sender=Project.tag.through)
+def index_project_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        index_projects([instance.id])
+    elif pk_set:
+        index_projects(list(pk_set))
+
+@receiver(post_delete, sender=Project)
+def remove_project_from_index(sender, instance, **kwargs):
+    remove_project(instance.id)
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_list(sender, **kwargs):
+    project_list_cache.invalidate(boundary=True)
+
+@receiver(donations_created)
+def invalidate_user_overlay(sender, donations, **kwargs):
+    for user_id in {donation.user_id for donation in donations}:
+        user_project_overlay.invalidate(user_id)
+        pin_to_primary(user_id)
+
+@receiver(donations_created)
+def queue_donation_leaderboards(sender, donations, **kwargs):
+    outbox.publish('leaderboards.refresh', [
+        {'project_id': project_id, 'boards': ['amount', 'people']}
+        for project_id in sorted({donation.project_id for donation in donations})
+    ])
+
+@receiver(donations_created)
+def publish_donation_events(sender, donations, **kwargs):
+    outbox.publish('donation.created', [{
+        'donation_id'      : donation.id,
+        'project_id'       : donation.project_id,
+        'user_id'          : donation.user_id,
+        'funding_option_id': donation.funding_option_id,
+    } for donation in donations])
+
+@receiver(post_save, sender=Project)
+def queue_project_leaderboards(sender, instance, **kwargs):
+    outbox.publish('leaderboards.refresh', [{'project_id': instance.id, 'boards': None}])
+
+@outbox.handler('leaderboards.refresh')
+def refresh_leaderboards(payload):
+    leaderboards.refresh(payload['project_id'], boards=payload['boards'])
+
+@receiver(post_delete, sender=Project)
+def invalidate_leaderboards(sender, **kwargs):
+    leaderboards.invalidate()
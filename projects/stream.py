@@ -0,0 +1,204 @@
+import re
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections                    import defaultdict
+
+from asgiref.sync                   import sync_to_async
+from django.core.serializers.json   import DjangoJSONEncoder
+from django.db                      import close_old_connections
+
+from .models                        import FundingOption, ProjectStats
+
+STREAM_PATH        = re.compile(r'^/projects/(?P<id>\d+)/stream$')
+KEEPALIVE_INTERVAL = 15
+
+logger = logging.getLogger(__name__)
+
+def funding_snapshot(project_id):
+    stats = ProjectStats.objects.filter(project_id=project_id).values_list('funding_amount', 'funding_count').first()
+
+    if stats is None:
+        return None
+
+    return {
+        'project_id'    : project_id,
+        'funding_amount': int(stats[0]),
+        'total_sponsor' : stats[1],
+        'funding_option': [{
+            'option_id': option_id,
+            'remains'  : remains,
+        } for option_id, remains in FundingOption.objects.filter(project_id=project_id).order_by('id').values_list('id', 'remains')],
+    }
+
+class FundingBroadcaster:
+    """
+    In-process fan-out of funding snapshots to server-sent event subscribers.
+
+    Every worker process polls ``ProjectStats.version`` of the projects its clients watch,
+    with one query per ``POLL_INTERVAL`` however many streams are open. The version is bumped
+    by every donation and funding option write, in whichever process or deployment served
+    it, so all workers see every change without the writing request doing any extra work.
+    A changed project's stats and option stock are read once and the same snapshot goes to
+    every open stream for it. Each subscriber keeps only the newest snapshot: a slow client
+    skips intermediate states, never lags. A snapshot equal to the last one sent is dropped.
+    """
+    POLL_INTERVAL = 1
+
+    def __init__(self):
+        self.lock        = threading.Lock()
+        self.subscribers = defaultdict(set)
+        self.latest      = {}
+        self.versions    = {}
+        self.poller      = None
+
+    def subscribe(self, project_id, snapshot = None):
+        queue = asyncio.Queue(maxsize=1)
+
+        with self.lock:
+            self.subscribers[project_id].add((asyncio.get_running_loop(), queue))
+            self.latest.setdefault(project_id, snapshot)
+
+        self.start()
+
+        return queue
+
+    def unsubscribe(self, project_id, queue):
+        with self.lock:
+            subscribers = self.subscribers.get(project_id, set())
+            subscribers.difference_update({subscriber for subscriber in subscribers if subscriber[1] is queue})
+
+            if not subscribers:
+                self.subscribers.pop(project_id, None)
+                self.latest.pop(project_id, None)
+                self.versions.pop(project_id, None)
+
+    def subscriber_count(self, project_id):
+        with self.lock:
+            return len(self.subscribers.get(project_id, ()))
+
+    def start(self):
+        with self.lock:
+            if self.poller is None or not self.poller.is_alive():
+                self.poller = threading.Thread(target=self.run, name='funding-broadcaster', daemon=True)
+                self.poller.start()
+
+    def run(self):
+        while True:
+            time.sleep(self.POLL_INTERVAL)
+
+            try:
+                self.poll()
+            except Exception:
+                logger.exception('Funding stream poll failed')
+            finally:
+                close_old_connections()
+
+    def poll(self):
+        with self.lock:
+            project_ids = list(self.subscribers)
+
+        if not project_ids:
+            return
+
+        for project_id, version in ProjectStats.objects.filter(project_id__in=project_ids).values_list('project_id', 'version'):
+            with self.lock:
+                changed = project_id in self.subscribers and self.versions.get(project_id) != version
+
+                if changed:
+                    self.versions[project_id] = version
+
+            if changed:
+                self.publish(project_id)
+
+    def publish(self, project_id):
+        with self.lock:
+            subscribers = list(self.subscribers.get(project_id, ()))
+
+        if not subscribers:
+            return
+
+        snapshot = funding_snapshot(project_id)
+
+        with self.lock:
+            if self.latest.get(project_id) == snapshot:
+                return
+
+            self.latest[project_id] = snapshot
+
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._offer, queue, snapshot)
+
+    def _offer(self, queue, snapshot):
+        if queue.full():
+            queue.get_nowait()
+
+        queue.put_nowait(snapshot)
+
+funding_broadcaster = FundingBroadcaster()
+
+def format_event(snapshot):
+    return f'event: funding\ndata: {json.dumps(snapshot, cls=DjangoJSONEncoder)}\n\n'.encode('utf-8')
+
+async def funding_stream(scope, receive, send, project_id):
+    snapshot = await sync_to_async(funding_snapshot)(project_id)
+
+    if snapshot is None:
+        await send({'type': 'http.response.start', 'status': 404, 'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': b'{"messages": "DOES_NOT_EXIST"}'})
+        return
+
+    queue = funding_broadcaster.subscribe(project_id, snapshot)
+
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type',      b'text/event-stream'),
+            (b'cache-control',     b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+        await send({'type': 'http.response.body', 'body': format_event(snapshot), 'more_body': True})
+
+        disconnect = asyncio.ensure_future(receive())
+
+        try:
+            while True:
+                update = asyncio.ensure_future(queue.get())
+                await asyncio.wait({update, disconnect}, timeout=KEEPALIVE_INTERVAL, return_when=asyncio.FIRST_COMPLETED)
+
+                delivered = update.done()
+
+                if delivered:
+                    await send({'type': 'http.response.body', 'body': format_event(update.result()), 'more_body': True})
+                else:
+                    update.cancel()
+
+                if disconnect.done():
+                    if disconnect.result()['type'] == 'http.disconnect':
+                        break
+
+                    disconnect = asyncio.ensure_future(receive())
+
+                elif not delivered:
+                    await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+        finally:
+            disconnect.cancel()
+
+    finally:
+        funding_broadcaster.unsubscribe(project_id, queue)
+
+def funding_stream_router(application):
+    """
+    Serves ``GET /projects/<id>/stream`` as a server-sent event stream and hands every other
+    request to ``application``.
+    """
+    async def router(scope, receive, send):
+        match = STREAM_PATH.match(scope.get('path', '')) if scope['type'] == 'http' else None
+
+        if match and scope['method'] == 'GET':
+            return await funding_stream(scope, receive, send, int(match.group('id')))
+
+        return await application(scope, receive, send)
+
+    return router
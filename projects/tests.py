@@ -1,9 +1,41 @@
-from django.test                    import TestCase, Client
+import json
+import time
+import queue
+import random
+import threading
+import asyncio
+from io                             import StringIO
+from datetime                       import datetime
+from decimal                        import Decimal
+from concurrent.futures             import ThreadPoolExecutor
+from unittest                       import skipUnless
+from unittest.mock                  import patch
+
+from asgiref.sync                   import async_to_sync, sync_to_async
+from django.db                      import connection, connections, transaction, OperationalError, IntegrityError
+from django.db.models               import F
+from django.conf                    import settings
+from django.core.management         import call_command
+from django.test                    import TestCase, TransactionTestCase, Client, RequestFactory, override_settings
+from django.test.utils              import CaptureQueriesContext
 from django.core.files.uploadedfile import SimpleUploadedFile
 
-from users.models                   import User
-from projects.models                import Project, Category, FundingOption, Donation
+from users.models                   import User, Likes
+from projects.models                import Project, Category, FundingOption, Donation, ProjectStats, Tag, RewardHold, IdempotencyKey, OutboxEvent, LeaderboardEntry
+from projects.search                import tokenize
+from projects.cache                 import project_list_cache, user_project_overlay
+from projects.stream                import funding_broadcaster, funding_stream_router
+from projects.leaderboards          import leaderboards
+from projects.batcher               import donation_batcher, DonationBatcher, PendingDonation
+from projects.holds                 import reward_holds, RewardHoldAllocator
+from projects.outbox                import outbox
+from projects.likes                 import project_likes, INSERT_IGNORE
+from projects.views                 import ProjectDetailView, ProjectLikeView
+from projects.signals               import donations_created
 from utils.auth                     import hash_password, issue_token
+from utils.explain                  import QueryPlanCapture
+from utils.pagination               import encode_cursor
+from utils.db_router                import ReplicaRouter, replica_reads, pin_cache
 
 class ProjectDetailTest(TestCase):
     @classmethod
@@ -136,8 +168,11 @@ class ProjectDetailTest(TestCase):
             remains     = 40
         )
 
+        outbox.drain()
+
     @classmethod
     def tearDownClass(cls):
+        OutboxEvent.objects.all().delete()
         Donation.objects.all().delete()
         FundingOption.objects.all().delete()
         Project.objects.all().delete()
@@ -162,6 +197,7 @@ class ProjectDetailTest(TestCase):
                     "funding_amount"       : 4000,
                     "target_amount"        : 1000000,
                     "total_sponsor"        : 3,
+                    "like_count"           : 0,
                     "end_date"             : "2021-05-31T00:00:00",
                     "funding_option"       :
                     [
@@ -213,6 +249,7 @@ class ProjectDetailTest(TestCase):
                     "funding_amount"       : 0,
                     "target_amount"        : 1000000,
                     "total_sponsor"        : 0,
+                    "like_count"           : 0,
                     "end_date"             : "2021-05-31T00:00:00",
                     "funding_option"       :
                     [
@@ -246,6 +283,133 @@ class ProjectDetailTest(TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_project_detail_sparse_fields(self):
+        client = Client()
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/projects/1?fields=id,title,target_amount')
+
+        self.assertEqual(response.json(), {'result': {'id': 1, 'title': '프로젝트1', 'target_amount': 1000000}})
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_project_detail_query_budget(self):
+        client  = Client()
+        user    = User.objects.get(id=2)
+        project = Project.objects.get(id=1)
+        options = FundingOption.objects.filter(project=project)
+
+        for option in options:
+            for _ in range(5):
+                Donation.objects.create(user=user, project=project, funding_option=option)
+
+        outbox.drain()
+
+        with self.assertNumQueries(2):
+            response = client.get('/projects/1')
+
+        with self.assertNumQueries(3):
+            liked = client.get('/projects/1', HTTP_AUTHORIZATION=issue_token(user))
+
+        self.assertEqual(response.json()['result']['total_sponsor'], 18)
+        self.assertEqual(response.json()['result']['funding_amount'], 34000)
+        self.assertEqual([option['selected_funding'] for option in response.json()['result']['funding_option']], [7, 6, 5])
+        self.assertEqual(liked.json()['result']['funding_option'], response.json()['result']['funding_option'])
+
+    def test_project_detail_not_modified(self):
+        client   = Client()
+        response = client.get('/projects/1')
+        etag     = response['ETag']
+
+        with self.assertNumQueries(1):
+            not_modified = client.get('/projects/1', HTTP_IF_NONE_MATCH=etag)
+
+        Donation.objects.create(
+            user           = User.objects.get(id=2),
+            project        = Project.objects.get(id=1),
+            funding_option = FundingOption.objects.get(id=1)
+        )
+        modified = client.get('/projects/1', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(modified.status_code, 200)
+        self.assertNotEqual(modified['ETag'], etag)
+
+    def test_project_detail_modified_by_creator_update(self):
+        client  = Client()
+        url     = '/projects/1?fields=creater,creater_introduction'
+        etag    = client.get(url)['ETag']
+        creater = User.objects.get(id=1)
+
+        creater.username     = 'renamed'
+        creater.introduction = '새 소개'
+        creater.save()
+
+        modified = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(modified.status_code, 200)
+        self.assertEqual(modified.json()['result'], {'creater': 'renamed', 'creater_introduction': '새 소개'})
+
+    def test_project_detail_same_second_writes_not_cached(self):
+        client   = Client()
+        response = client.get('/projects/1')
+        since    = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        Donation.objects.create(
+            user           = User.objects.get(id=2),
+            project        = Project.objects.get(id=1),
+            funding_option = FundingOption.objects.get(id=1)
+        )
+        outbox.drain()
+        modified = client.get('/projects/1', HTTP_IF_MODIFIED_SINCE=since)
+
+        self.assertEqual(modified.status_code, 200)
+        self.assertEqual(modified.json()['result']['total_sponsor'], response.json()['result']['total_sponsor'] + 1)
+
+    def test_project_detail_etag_per_user(self):
+        client     = Client()
+        etag       = client.get('/projects/1')['ETag']
+        user_token = issue_token(User.objects.get(id=2))
+
+        self.assertEqual(client.get('/projects/1', HTTP_IF_NONE_MATCH=etag, HTTP_AUTHORIZATION=user_token).status_code, 200)
+
+    def test_project_batch_success(self):
+        client   = Client()
+        user     = User.objects.get(id=2)
+        project  = Project.objects.get(id=2)
+        Likes.objects.create(user=user, project=project)
+
+        with self.assertNumQueries(2):
+            response = client.get('/projects/batch?ids=2,1,999,2', HTTP_AUTHORIZATION=issue_token(user))
+
+        results = response.json()['results']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['id'] for result in results], [2, 1])
+        self.assertEqual([result['is_liked'] for result in results], [True, False])
+        self.assertEqual(results[1], client.get('/projects/1').json()['result'])
+        self.assertEqual(response.json()['missing'], [999])
+
+    def test_project_batch_query_count_is_constant(self):
+        client = Client()
+
+        with self.assertNumQueries(1):
+            client.get('/projects/batch?ids=1')
+
+        with self.assertNumQueries(1):
+            response = client.get('/projects/batch?ids=1,2&fields=id,funding_option')
+
+        self.assertEqual([len(result['funding_option']) for result in response.json()['results']], [3, 3])
+
+    def test_project_batch_invalid_ids(self):
+        client = Client()
+
+        self.assertEqual(client.get('/projects/batch').json(), {'messages': 'INVALID_IDS'})
+        self.assertEqual(client.get('/projects/batch?ids=1,a').status_code, 400)
+        self.assertEqual(client.get('/projects/batch?ids=' + ','.join(map(str, range(1, 52)))).status_code, 400)
+
     def test_project_detail_does_not_exists(self):
         client   = Client()
         response = client.get('/projects/999')
@@ -282,6 +446,135 @@ class ProjectDetailTest(TestCase):
         self.assertEqual(like_patch_response.status_code, 401)
         self.assertEqual(like_patch_response.json(), {'status': 'UNAUTHORIZATION_ERROR', 'message': 'Login Required.'})
 
+class ProjectLikeTest(TestCase):
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.token   = issue_token(self.user)
+
+    def test_project_like_is_idempotent(self):
+        responses = [self.client.put(f'/projects/{self.project.id}/like', HTTP_AUTHORIZATION=self.token) for _ in range(3)]
+
+        self.assertEqual([response.status_code for response in responses], [200] * 3)
+        self.assertEqual(responses[-1].json()['is_liked'], True)
+        self.assertEqual(Likes.objects.filter(user=self.user, project=self.project).count(), 1)
+        self.assertEqual(OutboxEvent.objects.filter(topic='like.created').count(), 1)
+
+    def test_project_unlike_is_idempotent(self):
+        Likes.objects.create(user=self.user, project=self.project)
+
+        responses = [self.client.delete(f'/projects/{self.project.id}/like', HTTP_AUTHORIZATION=self.token) for _ in range(2)]
+
+        self.assertEqual([response.json()['is_liked'] for response in responses], [False, False])
+        self.assertFalse(Likes.objects.exists())
+        self.assertEqual(OutboxEvent.objects.filter(topic='like.deleted').count(), 1)
+
+    def test_project_like_toggle(self):
+        first  = self.client.patch(f'/projects/{self.project.id}', HTTP_AUTHORIZATION=self.token)
+        second = self.client.patch(f'/projects/{self.project.id}', HTTP_AUTHORIZATION=self.token)
+
+        self.assertEqual(first.json()['is_liked'], True)
+        self.assertEqual(second.json()['is_liked'], False)
+        self.assertFalse(Likes.objects.exists())
+
+    def test_project_like_count(self):
+        for _ in range(2):
+            self.client.put(f'/projects/{self.project.id}/like', HTTP_AUTHORIZATION=self.token)
+
+        liked = self.client.get(f'/projects/{self.project.id}?fields=like_count').json()['result']
+
+        self.client.delete(f'/projects/{self.project.id}/like', HTTP_AUTHORIZATION=self.token)
+        self.project.refresh_from_db()
+
+        self.assertEqual(liked, {'like_count': 1})
+        self.assertEqual(self.project.like_count, 0)
+
+    def test_project_list_sorted_by_likes(self):
+        other = Project.objects.create(
+            title           = '타이틀2',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = self.project.category,
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.client.put(f'/projects/{self.project.id}/like', HTTP_AUTHORIZATION=self.token)
+
+        response = self.client.get('/projects?sorted=likes&fields=id,like_count')
+
+        self.assertEqual(response.json()['data']['projects'], [
+            {'id': self.project.id, 'like_count': 1},
+            {'id': other.id,        'like_count': 0},
+        ])
+
+    def test_project_list_sorted_by_likes_pagination_ties(self):
+        projects = [self.project] + [Project.objects.create(
+            title           = f'타이틀{index}',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = self.project.category,
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        ) for index in range(2, 7)]
+
+        for project, like_count in zip(projects, [1, 3, 1, 3, 1, 0]):
+            Project.objects.filter(id=project.id).update(like_count=like_count)
+
+        full      = self.client.get('/projects?sorted=likes&fields=id,like_count').json()['data']['projects']
+        paged     = []
+        cursor    = ''
+
+        while True:
+            response = self.client.get(f'/projects?sorted=likes&fields=id,like_count&limit=2&cursor={cursor}').json()
+            paged   += response['data']['projects']
+            cursor   = response['data']['next_cursor']
+
+            if cursor is None:
+                break
+
+        self.assertEqual(paged, full)
+        self.assertEqual({project['id'] for project in paged}, {project.id for project in projects})
+        self.assertEqual([project['like_count'] for project in paged], [3, 3, 1, 1, 1, 0])
+
+    def test_rebuild_like_counts_command(self):
+        stdout = StringIO()
+
+        Likes.objects.create(user=self.user, project=self.project)
+        call_command('rebuild_like_counts', stdout=stdout)
+        self.project.refresh_from_db()
+
+        self.assertIn('Like Counts Repaired for 1 Projects.', stdout.getvalue())
+        self.assertEqual(self.project.like_count, 1)
+
+    def test_project_like_single_statement(self):
+        with CaptureQueriesContext(connection) as context:
+            project_likes.like(self.user, self.project.id)
+
+        statements = [query['sql'] for query in context.captured_queries if connection.ops.quote_name('likes') in query['sql']]
+
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith(INSERT_IGNORE[connection.vendor][0]))
+
+    def test_project_like_does_not_exist(self):
+        response = self.client.put('/projects/100/like', HTTP_AUTHORIZATION=self.token)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"status": "INVALID_PROJECT_ERROR", 'messages': 'Project does not exist.'})
+        self.assertFalse(Likes.objects.exists())
+
 class ProjectPaymentTest(TestCase):
     client = Client()
 
@@ -392,6 +685,521 @@ class ProjectPaymentTest(TestCase):
             {'messages': 'FUNDING_OPTION_ID_DOES_NOT EXIST'}
         )
 
+MAX_LOCK_RETRIES = 50
+
+def call_with_retries(view, request, **kwargs):
+    """
+    Runs ``view`` from a worker thread, retrying SQLite's "database is locked" a bounded number
+    of times with a jittered backoff. Returns the status code, or the name of the exception
+    that ended the request so that the caller can count failures instead of losing them.
+    """
+    try:
+        for attempt in range(MAX_LOCK_RETRIES):
+            try:
+                return view(request, **kwargs).status_code
+            except OperationalError:
+                time.sleep(random.uniform(0, min(0.001 * 2 ** attempt, 0.1)))
+
+        return 'OperationalError'
+    except Exception as e:
+        return type(e).__name__
+    finally:
+        connections.close_all()
+
+class ProjectPaymentConcurrencyTest(TransactionTestCase):
+    NUM_REQUESTS = 200
+    NUM_THREADS  = 20
+
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.option  = FundingOption.objects.create(
+            amount      = 2000,
+            project     = self.project,
+            remains     = 10,
+            title       = '한정판',
+            description = '10개 한정'
+        )
+
+    def donate(self, token):
+        view    = ProjectDetailView.as_view()
+        request = RequestFactory().put(
+            f'/projects/{self.project.id}', {'option_id': self.option.id},
+            HTTP_AUTHORIZATION=token, content_type='application/json'
+        )
+
+        return call_with_retries(view, request, id=self.project.id)
+
+    def test_project_payment_does_not_oversell(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('shared-cache in-memory SQLite fails concurrent writers instead of serializing them')
+
+        token = issue_token(self.user)
+
+        with ThreadPoolExecutor(max_workers=self.NUM_THREADS) as executor:
+            status_codes = list(executor.map(self.donate, [token] * self.NUM_REQUESTS))
+
+        self.option.refresh_from_db()
+
+        self.assertEqual([status_code for status_code in status_codes if status_code not in (201, 400)], [])
+        self.assertEqual(status_codes.count(201), 10)
+        self.assertEqual(status_codes.count(400), self.NUM_REQUESTS - 10)
+        self.assertEqual(self.option.remains, 0)
+        self.assertEqual(Donation.objects.filter(funding_option=self.option).count(), 10)
+
+        outbox.drain()
+        self.assertEqual(ProjectStats.objects.get(project=self.project).funding_count, 10)
+
+    @override_settings(DONATION_BATCHING=True)
+    def test_project_payment_group_commit_does_not_oversell(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('shared-cache in-memory SQLite fails concurrent writers instead of serializing them')
+
+        token = issue_token(self.user)
+
+        with patch.object(donation_batcher, 'process', wraps=donation_batcher.process) as process:
+            with ThreadPoolExecutor(max_workers=self.NUM_THREADS) as executor:
+                status_codes = list(executor.map(self.donate, [token] * self.NUM_REQUESTS))
+
+        self.option.refresh_from_db()
+
+        self.assertEqual([status_code for status_code in status_codes if status_code not in (201, 400)], [])
+        self.assertEqual(status_codes.count(201), 10)
+        self.assertEqual(status_codes.count(400), self.NUM_REQUESTS - 10)
+        self.assertLess(process.call_count, self.NUM_REQUESTS)
+        self.assertEqual(self.option.remains, 0)
+        self.assertEqual(Donation.objects.filter(funding_option=self.option).count(), 10)
+
+        outbox.drain()
+        self.assertEqual(ProjectStats.objects.get(project=self.project).funding_count, 10)
+
+    def test_project_payment_group_commit_single_insert(self):
+        batch     = [PendingDonation(self.user, {self.option.id: quantity}) for quantity in (1, 3, 2, 9)]
+        results   = []
+        committed = threading.Event()
+
+        with CaptureQueriesContext(connection) as context:
+            donation_batcher.process(batch, results, committed)
+
+        donations = connection.ops.quote_name(Donation._meta.db_table)
+        inserts   = [query['sql'] for query in context.captured_queries if query['sql'].startswith(f'INSERT INTO {donations}')]
+
+        self.assertEqual(results, ['SUCCESS', 'SUCCESS', 'SUCCESS', 'NO_STOCK'])
+        self.assertTrue(committed.is_set())
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Donation.objects.filter(funding_option=self.option).count(), 6)
+
+    @override_settings(DONATION_BATCHING=True)
+    def test_project_payment_group_commit_timeout_does_not_fall_back(self):
+        with patch.object(donation_batcher, 'start'), patch.object(donation_batcher, 'pending', queue.Queue()), \
+             patch.object(DonationBatcher, 'RESULT_TIMEOUT', 0.01):
+            status_code = self.donate(issue_token(self.user))
+
+        self.option.refresh_from_db()
+
+        self.assertEqual(status_code, 503)
+        self.assertEqual(self.option.remains, 10)
+        self.assertFalse(Donation.objects.exists())
+
+class ProjectLikeConcurrencyTest(TransactionTestCase):
+    NUM_REQUESTS = 40
+    NUM_THREADS  = 20
+
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+
+    def like(self, token):
+        view    = ProjectLikeView.as_view()
+        request = RequestFactory().put(f'/projects/{self.project.id}/like', HTTP_AUTHORIZATION=token)
+
+        return call_with_retries(view, request, id=self.project.id)
+
+    def test_project_like_concurrent_taps(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('shared-cache in-memory SQLite fails concurrent writers instead of serializing them')
+
+        token = issue_token(self.user)
+
+        with ThreadPoolExecutor(max_workers=self.NUM_THREADS) as executor:
+            status_codes = list(executor.map(self.like, [token] * self.NUM_REQUESTS))
+
+        self.assertEqual(status_codes, [200] * self.NUM_REQUESTS)
+        self.assertEqual(Likes.objects.filter(user=self.user, project=self.project).count(), 1)
+        self.assertEqual(OutboxEvent.objects.filter(topic='like.created').count(), 1)
+
+    def test_dedupe_likes_command(self):
+        stdout     = StringIO()
+        other      = User.objects.create(username='testuser2', email='test2@mail.com', password=hash_password('12345678'))
+        constraint = Likes._meta.constraints[0]
+
+        # SQLite rebuilds the table from Meta.constraints, so hide the constraint while removing it.
+        with connection.schema_editor() as editor, patch.object(Likes._meta, 'constraints', []):
+            editor.remove_constraint(Likes, constraint)
+
+        try:
+            first = Likes.objects.create(user=self.user, project=self.project)
+            Likes.objects.bulk_create([Likes(user=self.user, project=self.project) for _ in range(2)])
+            Likes.objects.create(user=other, project=self.project)
+            Project.objects.filter(id=self.project.id).update(like_count=4)
+
+            call_command('dedupe_likes', stdout=stdout)
+
+        finally:
+            with connection.schema_editor() as editor:
+                editor.add_constraint(Likes, constraint)
+
+        self.project.refresh_from_db()
+
+        self.assertIn('2 Duplicate Likes Removed, Like Counts Repaired for 1 Projects.', stdout.getvalue())
+        self.assertTrue(Likes.objects.filter(id=first.id).exists())
+        self.assertEqual(Likes.objects.filter(project=self.project).count(), 2)
+        self.assertEqual(self.project.like_count, 2)
+
+class ProjectMultiOptionPaymentTest(TestCase):
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.options = [FundingOption.objects.create(
+            amount      = amount,
+            project     = self.project,
+            remains     = remains,
+            title       = '상품옵션',
+            description = '상품설명'
+        ) for amount, remains in [(1000, None), (2000, 5), (3000, 3)]]
+
+    def donate(self, items):
+        return self.client.put(
+            f'/projects/{self.project.id}',
+            {'options': [{'option_id': option.id, 'quantity': quantity} for option, quantity in items]},
+            HTTP_AUTHORIZATION=issue_token(self.user), content_type='application/json'
+        )
+
+    def test_project_multi_option_payment_success(self):
+        unlimited, limited, scarce = self.options
+
+        received = []
+        receiver = lambda sender, donations, **kwargs: received.extend(donation.id for donation in donations)
+
+        donations_created.connect(receiver)
+
+        try:
+            with CaptureQueriesContext(connection) as context:
+                response = self.donate([(unlimited, 1), (limited, 2), (scarce, 3)])
+        finally:
+            donations_created.disconnect(receiver)
+
+        outbox.drain()
+
+        inserts = [query['sql'] for query in context.captured_queries if query['sql'].startswith('INSERT INTO "donations"')]
+        stats   = ProjectStats.objects.get(project=self.project)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(sorted(received), sorted(Donation.objects.filter(user=self.user).values_list('id', flat=True)))
+        self.assertEqual([option.remains for option in FundingOption.objects.filter(project=self.project).order_by('id')], [None, 3, 0])
+        self.assertEqual(Donation.objects.filter(user=self.user).count(), 6)
+        self.assertEqual((stats.funding_count, int(stats.funding_amount)), (6, 14000))
+
+    def test_project_multi_option_payment_is_atomic(self):
+        _, limited, scarce = self.options
+        response           = self.donate([(limited, 2), (scarce, 4)])
+
+        self.assertEqual(response.json(), {'messages': 'NO_STOCK'})
+        self.assertEqual([option.remains for option in FundingOption.objects.filter(project=self.project).order_by('id')], [None, 5, 3])
+        self.assertFalse(Donation.objects.exists())
+
+    def test_project_multi_option_payment_invalid_options(self):
+        unlimited, limited, _ = self.options
+
+        self.assertEqual(self.donate([(limited, 0)]).json(), {'messages': 'INVALID_OPTIONS'})
+        self.assertEqual(self.donate([(limited, 1), (limited, 1)]).json(), {'messages': 'INVALID_OPTIONS'})
+        self.assertEqual(self.donate([]).json(), {'messages': 'FUNDING_OPTION_ID_DOES_NOT EXIST'})
+
+    def test_project_multi_option_payment_quantity_capped(self):
+        unlimited, _, _ = self.options
+        others          = [FundingOption.objects.create(
+            amount      = 1000,
+            project     = self.project,
+            title       = '상품옵션',
+            description = '상품설명'
+        ) for _ in range(3)]
+
+        over_option  = self.donate([(unlimited, ProjectDetailView.MAX_OPTION_QUANTITY + 1)])
+        over_request = self.donate([(option, ProjectDetailView.MAX_OPTION_QUANTITY) for option in [unlimited] + others])
+
+        self.assertEqual(over_option.json(), {'messages': 'INVALID_OPTIONS'})
+        self.assertEqual(over_request.json(), {'messages': 'INVALID_OPTIONS'})
+        self.assertEqual(self.donate([(unlimited, ProjectDetailView.MAX_OPTION_QUANTITY)]).status_code, 201)
+        self.assertEqual(Donation.objects.count(), ProjectDetailView.MAX_OPTION_QUANTITY)
+
+class IdempotencyKeyTest(TestCase):
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.option  = FundingOption.objects.create(
+            amount      = 2000,
+            project     = self.project,
+            remains     = 10,
+            title       = '상품옵션1',
+            description = '상품설명'
+        )
+
+    def donate(self, key, quantity = 1):
+        return self.client.put(
+            f'/projects/{self.project.id}', {'options': [{'option_id': self.option.id, 'quantity': quantity}]},
+            HTTP_AUTHORIZATION=issue_token(self.user), HTTP_IDEMPOTENCY_KEY=key, content_type='application/json'
+        )
+
+    def test_idempotency_key_replays_response(self):
+        first = self.donate('retry-1')
+
+        with CaptureQueriesContext(connection) as context:
+            retry = self.donate('retry-1')
+
+        self.option.refresh_from_db()
+
+        self.assertEqual((retry.status_code, retry.json()), (first.status_code, first.json()))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertFalse([query for query in context.captured_queries if 'funding_options' in query['sql']])
+        self.assertEqual(Donation.objects.count(), 1)
+        self.assertEqual(self.option.remains, 9)
+
+    def test_idempotency_key_reused_with_other_body(self):
+        self.donate('retry-1')
+
+        self.assertEqual(self.donate('retry-1', quantity=2).status_code, 422)
+        self.assertEqual(self.donate('retry-2', quantity=2).status_code, 201)
+        self.assertEqual(Donation.objects.count(), 3)
+
+    def test_idempotency_key_purge(self):
+        self.donate('retry-1')
+        self.donate('retry-2')
+        IdempotencyKey.objects.filter(key='retry-1').update(expires_at=datetime(2021, 1, 1))
+
+        call_command('purge_idempotency_keys', stdout=StringIO())
+
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['retry-2'])
+        self.assertEqual(self.donate('retry-1').status_code, 201)
+        self.assertEqual(Donation.objects.count(), 3)
+
+class ProjectHoldTest(TestCase):
+    def setUp(self):
+        self.users   = [User.objects.create(
+            username = f'testuser{index}',
+            email    = f'test{index}@mail.com',
+            password = hash_password('12345678')
+        ) for index in range(4)]
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.users[0],
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.option  = FundingOption.objects.create(
+            amount      = 2000,
+            project     = self.project,
+            remains     = 2,
+            title       = '한정판',
+            description = '2개 한정'
+        )
+
+    def tearDown(self):
+        reward_holds.cache.delete(reward_holds.sold_out_key(self.option.id))
+
+    def hold(self, user):
+        return self.client.post(
+            f'/projects/{self.project.id}/holds', {'option_id': self.option.id},
+            HTTP_AUTHORIZATION=issue_token(user), content_type='application/json'
+        )
+
+    def donate(self, user, hold_token = None):
+        return self.client.put(
+            f'/projects/{self.project.id}', {'option_id': self.option.id, 'hold_token': hold_token},
+            HTTP_AUTHORIZATION=issue_token(user), content_type='application/json'
+        )
+
+    def test_project_hold_contention_is_not_sold_out(self):
+        with patch.object(RewardHoldAllocator, 'MAX_ATTEMPTS', 0):
+            response = self.hold(self.users[0])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json(), {'messages': 'HOLD_BUSY'})
+        self.assertFalse(reward_holds.is_sold_out(self.option.id))
+        self.assertEqual(self.hold(self.users[0]).status_code, 201)
+
+    def test_project_hold_invalid_body(self):
+        token = issue_token(self.users[0])
+
+        for body in ['not json', json.dumps({'option_id': 'abc'}), json.dumps({'option_id': [1]})]:
+            response = self.client.post(f'/projects/{self.project.id}/holds', body,
+                                        HTTP_AUTHORIZATION=token, content_type='application/json')
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'messages': 'INVALID_OPTIONS'})
+
+    def test_project_hold_claims_until_sold_out(self):
+        first, second, third, _ = self.users
+        first_hold              = self.hold(first).json()
+
+        self.assertEqual(self.hold(first).json()['hold_token'], first_hold['hold_token'])
+        self.assertEqual(self.hold(second).status_code, 201)
+        self.assertEqual(self.hold(third).json(), {'messages': 'NO_STOCK'})
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.hold(third).status_code, 400)
+
+    def test_project_hold_expired_returns_to_stock(self):
+        first, second, third, _ = self.users
+        first_token             = self.hold(first).json()['hold_token']
+        self.hold(second)
+
+        RewardHold.objects.filter(token=first_token).update(expires_at=datetime(2021, 1, 1))
+        third_token = self.hold(third).json()['hold_token']
+
+        self.assertEqual(self.donate(first, first_token).json(), {'messages': 'HOLD_EXPIRED'})
+        self.assertEqual(self.donate(third, third_token).status_code, 201)
+        self.assertEqual(RewardHold.objects.filter(funding_option=self.option).count(), 1)
+
+    def test_project_hold_rejects_quantities(self):
+        token    = self.hold(self.users[0]).json()['hold_token']
+        options  = lambda hold_token: {'options': [{'option_id': self.option.id, 'quantity': 2, 'hold_token': hold_token}]}
+        held     = self.client.put(f'/projects/{self.project.id}', options(token),
+                                   HTTP_AUTHORIZATION=issue_token(self.users[0]), content_type='application/json')
+        unheld   = self.client.put(f'/projects/{self.project.id}', options(None),
+                                   HTTP_AUTHORIZATION=issue_token(self.users[1]), content_type='application/json')
+
+        self.assertEqual(held.json(), {'messages': 'INVALID_OPTIONS'})
+        self.assertEqual(unheld.json(), {'messages': 'INVALID_OPTIONS'})
+        self.assertEqual(self.donate(self.users[0], token).status_code, 201)
+
+    def test_project_hold_required_once_holds_exist(self):
+        self.hold(self.users[0])
+        response = self.donate(self.users[1])
+
+        self.option.refresh_from_db()
+
+        self.assertEqual(response.json(), {'messages': 'HOLD_REQUIRED'})
+        self.assertEqual(self.option.remains, 2)
+
+class OutboxTest(TestCase):
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.option  = FundingOption.objects.create(
+            amount      = 1000,
+            project     = self.project,
+            remains     = 5,
+            title       = '상품옵션',
+            description = '상품설명'
+        )
+        OutboxEvent.objects.all().delete()
+
+    def test_outbox_written_with_donation_and_like(self):
+        token = issue_token(self.user)
+
+        self.client.put(f'/projects/{self.project.id}', {'options': [{'option_id': self.option.id, 'quantity': 2}]},
+                        HTTP_AUTHORIZATION=token, content_type='application/json')
+        self.client.patch(f'/projects/{self.project.id}', HTTP_AUTHORIZATION=token)
+
+        self.assertEqual(list(OutboxEvent.objects.order_by('id').values_list('topic', flat=True)),
+                         ['stats.donations', 'leaderboards.refresh', 'donation.created', 'donation.created', 'like.created'])
+        self.assertEqual(list(OutboxEvent.objects.filter(topic='donation.created').order_by('id').values_list('payload', flat=True)), [{
+            'donation_id'      : donation_id,
+            'project_id'       : self.project.id,
+            'user_id'          : self.user.id,
+            'funding_option_id': self.option.id,
+        } for donation_id in Donation.objects.order_by('id').values_list('id', flat=True)])
+        self.assertEqual(OutboxEvent.objects.last().payload, {'project_id': self.project.id, 'user_id': self.user.id})
+
+    def test_outbox_rolled_back_with_donation(self):
+        self.option.remains = 0
+        self.option.save()
+
+        self.client.put(f'/projects/{self.project.id}', {'option_id': self.option.id},
+                        HTTP_AUTHORIZATION=issue_token(self.user), content_type='application/json')
+
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_outbox_drain_delivers_and_retries(self):
+        delivered = []
+
+        def handler(payload):
+            if payload['fail']:
+                raise ValueError(payload)
+            delivered.append(payload)
+
+        outbox.publish('test.event', [{'fail': False}, {'fail': True}, {'fail': False}])
+
+        with patch.dict(outbox.handlers, {'test.event': [handler]}):
+            with self.assertLogs('projects.outbox', 'ERROR'):
+                self.assertEqual(outbox.drain(), (2, 1))
+            self.assertEqual(outbox.drain(), (0, 0))
+
+        failed = OutboxEvent.objects.get(processed_at__isnull=True)
+
+        self.assertEqual(delivered, [{'fail': False}, {'fail': False}])
+        self.assertEqual(failed.attempts, 1)
+        self.assertGreater(failed.available_at, datetime.now())
+
+    def test_drain_outbox_command(self):
+        stdout = StringIO()
+
+        outbox.publish('test.event', [{}] * 3)
+        call_command('drain_outbox', '--once', '--batch-size', '2', stdout=stdout)
+
+        self.assertIn('3 Outbox Events Processed, 0 Failed', stdout.getvalue())
+        self.assertFalse(OutboxEvent.objects.filter(processed_at__isnull=True).exists())
+
 class ProjectListTest(TestCase):
     def setUp(self):
         user_1 = User.objects.create(
@@ -521,6 +1329,8 @@ class ProjectListTest(TestCase):
                         user = user_2
                     )
 
+        outbox.drain()
+
     def tearDown(self):
         Donation.objects.all().delete()
         FundingOption.objects.all().delete()
@@ -546,11 +1356,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명 테스트",
                             "funding_amount":0.0,
                             "funding_count":0,
+                            "like_count":0,
                             "target_amount":500000.0,
                             "launch_date":"2121-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"scheduled",
-                            "progress":"0.000000"
+                            "progress":"0.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id":self.project_2.id,
@@ -561,11 +1374,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id": self.project_1.id,
@@ -576,13 +1392,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":3000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":100000.0,
                             "launch_date":"2021-05-20T00:00:00",
                             "end_date":"2021-05-29T00:00:00",
                             "status":"done",
-                            "progress":"3.000000"
+                            "progress":"3.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
     
@@ -604,11 +1424,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id": self.project_1.id,
@@ -619,11 +1442,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":3000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":100000.0,
                             "launch_date":"2021-05-20T00:00:00",
                             "end_date":"2021-05-29T00:00:00",
                             "status":"done",
-                            "progress":"3.000000"
+                            "progress":"3.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id":self.project_3.id,
@@ -634,13 +1460,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명 테스트",
                             "funding_amount":0.0,
                             "funding_count":0,
+                            "like_count":0,
                             "target_amount":500000.0,
                             "launch_date":"2121-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"scheduled",
-                            "progress":"0.000000"
+                            "progress":"0.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         },
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
         
@@ -662,11 +1492,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id": self.project_1.id,
@@ -677,11 +1510,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":3000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":100000.0,
                             "launch_date":"2021-05-20T00:00:00",
                             "end_date":"2021-05-29T00:00:00",
                             "status":"done",
-                            "progress":"3.000000"
+                            "progress":"3.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id":self.project_3.id,
@@ -692,13 +1528,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명 테스트",
                             "funding_amount":0.0,
                             "funding_count":0,
+                            "like_count":0,
                             "target_amount":500000.0,
                             "launch_date":"2121-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"scheduled",
-                            "progress":"0.000000"
+                            "progress":"0.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         },
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
         
@@ -720,11 +1560,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":3000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":100000.0,
                             "launch_date":"2021-05-20T00:00:00",
                             "end_date":"2021-05-29T00:00:00",
                             "status":"done",
-                            "progress":"3.000000"
+                            "progress":"3.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id":self.project_2.id,
@@ -735,11 +1578,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id":self.project_3.id,
@@ -750,13 +1596,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명 테스트",
                             "funding_amount":0.0,
                             "funding_count":0,
+                            "like_count":0,
                             "target_amount":500000.0,
                             "launch_date":"2121-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"scheduled",
-                            "progress":"0.000000"
+                            "progress":"0.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
@@ -778,13 +1628,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명 테스트",
                             "funding_amount":0.0,
                             "funding_count":0,
+                            "like_count":0,
                             "target_amount":500000.0,
                             "launch_date":"2121-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"scheduled",
-                            "progress":"0.000000"
+                            "progress":"0.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
@@ -806,13 +1660,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":3000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":100000.0,
                             "launch_date":"2021-05-20T00:00:00",
                             "end_date":"2021-05-29T00:00:00",
                             "status":"done",
-                            "progress":"3.000000"
+                            "progress":"3.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
@@ -834,13 +1692,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
@@ -862,13 +1724,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명 테스트",
                             "funding_amount":0.0,
                             "funding_count":0,
+                            "like_count":0,
                             "target_amount":500000.0,
                             "launch_date":"2121-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"scheduled",
-                            "progress":"0.000000"
+                            "progress":"0.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
@@ -890,13 +1756,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
@@ -918,13 +1788,17 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
@@ -946,11 +1820,14 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명 테스트",
                             "funding_amount":0.0,
                             "funding_count":0,
+                            "like_count":0,
                             "target_amount":500000.0,
                             "launch_date":"2121-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"scheduled",
-                            "progress":"0.000000"
+                            "progress":"0.000000",
+                            "is_liked":False,
+                            "is_donated":False
                         },
                         {
                             "id":self.project_2.id,
@@ -961,16 +1838,159 @@ class ProjectListTest(TestCase):
                             "summary":"프로젝트 설명",
                             "funding_amount":5000.0,
                             "funding_count":2,
+                            "like_count":0,
                             "target_amount":300000.0,
                             "launch_date":"2021-05-24T00:00:00",
                             "end_date":"2121-05-30T00:00:00",
                             "status":"ing",
-                            "progress":"1.666667"
+                            "progress":"1.666667",
+                            "is_liked":False,
+                            "is_donated":False
                         }
-                    ]
+                    ],
+                    "next_cursor":None
                 }
             })
 
+    def test_project_filter_status_is_sargable(self):
+        now         = datetime(2021, 6, 1)
+        end_date    = connection.ops.quote_name('end_date')
+        launch_date = connection.ops.quote_name('launch_date')
+
+        for status, predicates in [
+            ('done',      [f'{end_date} <']),
+            ('scheduled', [f'{end_date} >=', f'{launch_date} >']),
+            ('ing',       [f'{end_date} >=', f'{launch_date} <=']),
+        ]:
+            where = str(Project.objects.filter_status(status, now).query).split(' WHERE ')[1]
+
+            self.assertNotIn('CASE', where)
+            for predicate in predicates:
+                self.assertIn(predicate, where)
+
+        self.assertEqual(
+            [set(Project.objects.filter_status(status, now)) for status in ['done', 'ing', 'scheduled']],
+            [{self.project_1}, {self.project_2}, {self.project_3}]
+        )
+
+    def test_projectlistview_get_status_filter_sql(self):
+        client = Client()
+
+        with CaptureQueriesContext(connection) as context:
+            client.get('/projects?status=ing&limit=5')
+
+        listing_sql = next(query['sql'] for query in context.captured_queries if 'LIMIT 6' in query['sql'])
+        where       = listing_sql.split(' WHERE ')[1].split(' ORDER BY ')[0]
+
+        self.assertNotIn('CASE', where)
+        self.assertIn(connection.ops.quote_name('end_date'), where)
+
+    def test_projectlistview_get_sparse_fields(self):
+        client = Client()
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get('/projects?fields=id,title,title_image_url,progress')
+
+        listing_sql = next(query['sql'] for query in context.captured_queries if 'LIMIT 21' in query['sql'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [set(project) for project in response.json()['data']['projects']],
+            [{'id', 'title', 'title_image_url', 'progress'}] * 3
+        )
+        self.assertNotIn('summary', listing_sql)
+        self.assertNotIn(connection.ops.quote_name('users'), listing_sql)
+        self.assertNotIn(connection.ops.quote_name('categories'), listing_sql)
+
+    def test_projectlistview_get_unknown_fields(self):
+        client   = Client()
+        response = client.get('/projects?fields=id,secret')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"status": "INVALID_PARAMETER_ERROR", "message": "Unknown fields: secret"})
+
+    def test_projectlistview_get_cursor_pagination(self):
+        client = Client()
+
+        for sort_criteria in ['latest', 'people', 'amount', 'old', 'likes']:
+            full_response = client.get(f'/projects?sorted={sort_criteria}').json()
+            expected_ids  = [project['id'] for project in full_response['data']['projects']]
+            paged_ids     = []
+            cursor        = ''
+
+            while True:
+                response = client.get(f'/projects?sorted={sort_criteria}&limit=1&cursor={cursor}').json()
+                paged_ids += [project['id'] for project in response['data']['projects']]
+                cursor    = response['data']['next_cursor']
+
+                if cursor is None:
+                    break
+
+            self.assertEqual(paged_ids, expected_ids)
+
+    def test_projectlistview_get_invalid_cursor(self):
+        client   = Client()
+        response = client.get('/projects?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"status": "INVALID_CURSOR_ERROR", "message": "Invalid cursor."})
+
+    def test_projectlistview_get_cursor_from_other_sort(self):
+        client  = Client()
+        sorts   = ['latest', 'people', 'amount', 'old', 'likes']
+        cursors = {sort_criteria: client.get(f'/projects?sorted={sort_criteria}&limit=1').json()['data']['next_cursor'] for sort_criteria in sorts}
+        forged  = [
+            encode_cursor(Decimal('1000'), self.project_1.id, '-created_at'),
+            encode_cursor(datetime(2021, 5, 1), self.project_1.id, '-stats__funding_amount'),
+            encode_cursor(1.5, self.project_1.id, '-search_rank:타이틀'),
+        ]
+
+        for issued_for, cursor in cursors.items():
+            for sort_criteria in sorts:
+                if sort_criteria != issued_for:
+                    response = client.get(f'/projects?sorted={sort_criteria}&limit=1&cursor={cursor}')
+
+                    self.assertEqual(response.status_code, 400, (issued_for, sort_criteria))
+
+        for cursor, query in zip(forged, ['sorted=latest', 'sorted=amount', 'search=테스트']):
+            response = client.get(f'/projects?{query}&cursor={cursor}')
+
+            self.assertEqual(response.json(), {"status": "INVALID_CURSOR_ERROR", "message": "Invalid cursor."})
+
+    def test_projectlistview_get_user_flags_do_not_skew_aggregates(self):
+        client  = Client()
+        user    = User.objects.get(email='test2@mail.com')
+        token   = issue_token(user)
+        option  = FundingOption.objects.filter(project=self.project_2).first()
+
+        Likes.objects.create(user=user, project=self.project_2)
+        Likes.objects.create(user=User.objects.get(email='test1@mail.com'), project=self.project_2)
+
+        for _ in range(3):
+            Donation.objects.create(user=user, project=self.project_2, funding_option=option)
+
+        outbox.drain()
+
+        anonymous_project = next(project for project in client.get('/projects').json()['data']['projects'] if project['id'] == self.project_2.id)
+        user_project      = next(project for project in client.get('/projects', HTTP_AUTHORIZATION=token).json()['data']['projects'] if project['id'] == self.project_2.id)
+
+        self.assertEqual(user_project['funding_amount'], 8000.0)
+        self.assertEqual(user_project['funding_count'], 5)
+        self.assertEqual(user_project['progress'], anonymous_project['progress'])
+        self.assertTrue(user_project['is_liked'])
+        self.assertTrue(user_project['is_donated'])
+        self.assertFalse(anonymous_project['is_liked'])
+
+    def test_projectlistview_get_filter_liked(self):
+        client = Client()
+        user   = User.objects.get(email='test2@mail.com')
+
+        Likes.objects.create(user=user, project=self.project_1)
+
+        response = client.get('/projects?liked=true', HTTP_AUTHORIZATION=issue_token(user)).json()
+
+        self.assertEqual([project['id'] for project in response['data']['projects']], [self.project_1.id])
+
 class ProjectRegisterTest(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -1032,4 +2052,619 @@ class ProjectRegisterTest(TestCase):
         }
         signin_response = self.client.post('/users/signin', data=user_data, content_type="application/json")
         token           = signin_response.json().get("data").get("token")
-        client.post('/projects', data, format='multipart')
\ No newline at end of file
+        client.post('/projects', data, format='multipart')
+
+class ProjectStatsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username          = 'testuser1',
+            email             = 'test1@mail.com',
+            password          = hash_password('12345678'),
+            profile_image_url = 'test.jpg'
+        )
+
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+
+        self.option = FundingOption.objects.create(
+            amount      = 2000,
+            project     = self.project,
+            remains     = 10,
+            title       = '상품옵션1',
+            description = '상품설명'
+        )
+
+    def test_project_stats_created_with_project(self):
+        stats = ProjectStats.objects.get(project=self.project)
+
+        self.assertEqual((stats.funding_amount, stats.funding_count, stats.last_donated_at), (0, 0, None))
+
+    def test_project_stats_updated_on_donation(self):
+        donations = [Donation.objects.create(user=self.user, project=self.project, funding_option=self.option) for _ in range(3)]
+        pending   = ProjectStats.objects.get(project=self.project)
+
+        outbox.drain()
+        stats     = ProjectStats.objects.get(project=self.project)
+
+        self.assertEqual((pending.funding_amount, pending.funding_count), (0, 0))
+        self.assertEqual(stats.funding_amount, 6000)
+        self.assertEqual(stats.funding_count, 3)
+        self.assertEqual(stats.last_donated_at, donations[-1].created_at)
+
+    def test_project_stats_rebuild(self):
+        Donation.objects.create(user=self.user, project=self.project, funding_option=self.option)
+        ProjectStats.objects.filter(project=self.project).update(funding_amount=0, funding_count=0)
+
+        ProjectStats.rebuild()
+        stats = ProjectStats.objects.get(project=self.project)
+
+        self.assertEqual((stats.funding_amount, stats.funding_count), (2000, 1))
+
+class ProjectFundingStreamTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username          = 'testuser1',
+            email             = 'test1@mail.com',
+            password          = hash_password('12345678'),
+            profile_image_url = 'test.jpg'
+        )
+
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+
+        self.option = FundingOption.objects.create(
+            amount      = 2000,
+            project     = self.project,
+            remains     = 10,
+            title       = '상품옵션1',
+            description = '상품설명'
+        )
+
+        self.application = funding_stream_router(None)
+
+        poller = patch.object(funding_broadcaster, 'start')
+        poller.start()
+        self.addCleanup(poller.stop)
+
+    def donate(self):
+        Donation.objects.create(user=self.user, project=self.project, funding_option=self.option)
+        FundingOption.objects.filter(id=self.option.id).update(remains=F('remains') - 1)
+        outbox.drain()
+        funding_broadcaster.poll()
+
+    async def stream(self, path, actions):
+        inbox = asyncio.Queue()
+        sent  = []
+
+        async def send(message):
+            sent.append(message)
+
+        task = asyncio.ensure_future(self.application(
+            {'type': 'http', 'method': 'GET', 'path': path}, inbox.get, send
+        ))
+
+        for action in actions:
+            while not task.done() and len(sent) < 2:
+                await asyncio.sleep(0)
+
+            await action()
+            await asyncio.sleep(0)
+
+        await inbox.put({'type': 'http.disconnect'})
+        await task
+
+        return sent
+
+    def events(self, sent):
+        return [
+            json.loads(message['body'].decode('utf-8').split('data: ')[1])
+            for message in sent if message['type'] == 'http.response.body' and message['body'].startswith(b'event:')
+        ]
+
+    def test_funding_stream_pushes_donations(self):
+        sent   = async_to_sync(self.stream)(f'/projects/{self.project.id}/stream', [sync_to_async(self.donate)])
+        events = self.events(sent)
+
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), sent[0]['headers'])
+        self.assertEqual([event['funding_amount'] for event in events], [0, 2000])
+        self.assertEqual([event['total_sponsor'] for event in events], [0, 1])
+        self.assertEqual(events[-1]['funding_option'], [{'option_id': self.option.id, 'remains': 9}])
+        self.assertEqual(funding_broadcaster.subscriber_count(self.project.id), 0)
+
+    def test_funding_stream_skips_reads_without_subscribers(self):
+        with self.assertNumQueries(0):
+            funding_broadcaster.poll()
+            funding_broadcaster.publish(self.project.id)
+
+    def test_funding_stream_polls_versions_only(self):
+        def unchanged():
+            with self.assertNumQueries(1):
+                funding_broadcaster.poll()
+
+        sent = async_to_sync(self.stream)(f'/projects/{self.project.id}/stream', [
+            sync_to_async(funding_broadcaster.poll), sync_to_async(unchanged)
+        ])
+
+        self.assertEqual(len(self.events(sent)), 1)
+
+    def test_donation_request_does_not_read_snapshots(self):
+        with patch('projects.stream.funding_snapshot') as funding_snapshot:
+            self.client.put(f'/projects/{self.project.id}', {'option_id': self.option.id},
+                            HTTP_AUTHORIZATION=issue_token(self.user), content_type='application/json')
+
+        funding_snapshot.assert_not_called()
+
+    def test_funding_stream_does_not_exist(self):
+        sent = async_to_sync(self.stream)('/projects/999/stream', [])
+
+        self.assertEqual(sent[0]['status'], 404)
+        self.assertEqual(json.loads(sent[1]['body']), {'messages': 'DOES_NOT_EXIST'})
+
+class LeaderboardTest(TestCase):
+    def setUp(self):
+        self.user     = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.category = Category.objects.create(name='카테고리1')
+        self.other    = Category.objects.create(name='카테고리2')
+        self.projects = [Project.objects.create(
+            title           = f'프로젝트{index}',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = category,
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = end_date
+        ) for index, (category, end_date) in enumerate([
+            (self.category, '2121-05-29'),
+            (self.category, '2121-03-29'),
+            (self.other,    '2121-04-29'),
+            (self.category, '2021-05-29'),
+        ])]
+        self.options  = [FundingOption.objects.create(
+            amount      = amount,
+            project     = project,
+            title       = '상품옵션',
+            description = '상품설명'
+        ) for project, amount in zip(self.projects, [1000, 5000, 3000, 9000])]
+
+        for option, count in zip(self.options, [3, 1, 2, 5]):
+            for _ in range(count):
+                self.donate(option)
+
+        outbox.drain()
+        leaderboards.invalidate()
+
+    def donate(self, option):
+        Donation.objects.create(user=self.user, project=option.project, funding_option=option)
+
+    def ids(self, board, **params):
+        return [project['id'] for project in Client().get('/projects/leaderboards', params).json()['data'][board]]
+
+    def test_leaderboards_ranked(self):
+        first, second, third, _ = [project.id for project in self.projects]
+
+        self.assertEqual(self.ids('amount'), [third, second, first])
+        self.assertEqual(self.ids('people'), [first, third, second])
+        self.assertEqual(self.ids('ending'), [second, third, first])
+        self.assertEqual(self.ids('amount', category='카테고리1'), [second, first])
+
+    def test_leaderboards_updated_incrementally(self):
+        first, second, third, _ = [project.id for project in self.projects]
+
+        with patch.object(leaderboards, 'SIZE', 2):
+            Client().get('/projects/leaderboards')
+
+            for _ in range(3):
+                self.donate(self.options[0])
+
+            outbox.drain()
+
+            with self.assertNumQueries(1):
+                response = Client().get('/projects/leaderboards?board=amount,people')
+
+        self.assertEqual([project['id'] for project in response.json()['data']['amount']], [first, third])
+        self.assertEqual([project['id'] for project in response.json()['data']['people']], [first, third])
+        self.assertEqual(response.json()['data']['amount'][0]['funding_amount'], 6000.0)
+
+    def test_leaderboards_drop_finished_projects(self):
+        first, second, third, _ = [project.id for project in self.projects]
+
+        Client().get('/projects/leaderboards')
+        self.projects[2].end_date = '2021-05-29'
+        self.projects[2].save()
+        outbox.drain()
+
+        self.assertEqual(self.ids('amount'), [second, first])
+
+    def test_leaderboards_refreshed_outside_request(self):
+        Client().get('/projects/leaderboards')
+
+        with patch.object(leaderboards, 'refresh') as refresh:
+            self.donate(self.options[1])
+
+        refresh.assert_not_called()
+        self.assertTrue(OutboxEvent.objects.filter(topic='leaderboards.refresh', processed_at__isnull=True).exists())
+
+    def test_leaderboards_overall_scope_unique(self):
+        Client().get('/projects/leaderboards')
+        entry = LeaderboardEntry.objects.filter(board='amount', scope=LeaderboardEntry.OVERALL).first()
+
+        with self.assertRaises(IntegrityError):
+            LeaderboardEntry.objects.create(board='amount', category=None, scope=LeaderboardEntry.OVERALL, project=entry.project, score=0)
+
+    def test_leaderboards_zero_target_fund(self):
+        Project.objects.filter(id=self.projects[0].id).update(target_fund=0)
+
+        response = Client().get('/projects/leaderboards?board=people')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['people'][0]['progress'], None)
+
+    def test_leaderboards_project_without_stats(self):
+        first, second, third, _ = [project.id for project in self.projects]
+
+        ProjectStats.objects.filter(project_id=first).delete()
+        leaderboards.invalidate()
+        response = Client().get('/projects/leaderboards')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([project['id'] for project in response.json()['data']['amount']], [third, second])
+        self.assertEqual(response.json()['data']['ending'][-1]['id'], first)
+        self.assertEqual(response.json()['data']['ending'][-1]['funding_count'], 0)
+
+        leaderboards.refresh(first)
+
+        self.assertEqual(self.ids('people'), [third, second])
+
+    def test_leaderboards_unknown_board(self):
+        response = Client().get('/projects/leaderboards?board=amount,hot')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'status': 'INVALID_PARAMETER_ERROR', 'message': 'Unknown fields: hot'})
+
+class ProjectSearchTest(TestCase):
+    def setUp(self):
+        user     = User.objects.create(
+            username          = 'testuser1',
+            email             = 'test1@mail.com',
+            password          = hash_password('12345678'),
+            profile_image_url = 'test.jpg'
+        )
+        category = Category.objects.create(name='카테고리1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.projects = [Project.objects.create(
+                title           = title,
+                creater         = user,
+                summary         = summary,
+                category        = category,
+                title_image_url = 'test.jpg',
+                target_fund     = 100000,
+                launch_date     = '2021-05-20',
+                end_date        = '2121-05-29'
+            ) for title, summary in [
+                ('국물 떡볶이', '떡볶이 떡볶이 떡볶이'),
+                ('짜장 떡볶이', '달콤한 짜장 소스'),
+                ('순대 모둠',   '찹쌀 순대'),
+            ]]
+
+            Tag.objects.create(name='매운맛').project_set.add(self.projects[2])
+
+    def test_tokenize_bigrams(self):
+        self.assertEqual(tokenize('떡볶이 A'), ['떡볶', '볶이', 'a'])
+
+    def test_projectlistview_get_search_ranked(self):
+        client   = Client()
+        response = client.get('/projects?search=떡볶이').json()
+
+        self.assertEqual([project['id'] for project in response['data']['projects']], [self.projects[0].id, self.projects[1].id])
+
+    def test_projectlistview_get_search_tag(self):
+        client   = Client()
+        response = client.get('/projects?search=매운맛').json()
+
+        self.assertEqual([project['id'] for project in response['data']['projects']], [self.projects[2].id])
+
+    def test_projectlistview_get_search_sorted_latest(self):
+        client   = Client()
+        response = client.get('/projects?search=떡볶이&sorted=latest').json()
+
+        self.assertEqual([project['id'] for project in response['data']['projects']], [self.projects[1].id, self.projects[0].id])
+
+    def test_projectlistview_get_search_single_character(self):
+        response = Client().get('/projects?search=짜').json()
+
+        self.assertEqual([project['id'] for project in response['data']['projects']], [self.projects[1].id])
+
+    def test_projectlistview_get_search_paginates_all_matches(self):
+        response = Client().get('/projects?search=떡볶이&limit=1').json()
+        cursor   = response['data']['next_cursor']
+        second   = Client().get(f'/projects?search=떡볶이&limit=1&cursor={cursor}').json()
+
+        self.assertEqual([project['id'] for project in second['data']['projects']], [self.projects[1].id])
+
+    def test_search_index_ignores_rolled_back_writes(self):
+        try:
+            with transaction.atomic():
+                self.projects[2].title = '치즈 떡볶이'
+                self.projects[2].save()
+                raise IntegrityError
+        except IntegrityError:
+            pass
+
+        response = Client().get('/projects?search=치즈').json()
+
+        self.assertEqual(response['data']['projects'], [])
+
+class ProjectListCacheTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username          = 'testuser1',
+            email             = 'test1@mail.com',
+            password          = hash_password('12345678'),
+            profile_image_url = 'test.jpg'
+        )
+
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+
+        self.option = FundingOption.objects.create(
+            amount      = 2000,
+            project     = self.project,
+            remains     = 10,
+            title       = '상품옵션1',
+            description = '상품설명'
+        )
+
+    def test_project_list_cache_hit(self):
+        client = Client()
+        before = project_list_cache.stats()
+
+        first_response  = client.get('/projects?sorted=latest&category=카테고리1')
+        second_response = client.get('/projects?category=카테고리1&sorted=latest')
+        after           = project_list_cache.stats()
+
+        self.assertEqual(first_response.json(), second_response.json())
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    def test_project_list_cache_shared_with_user_overlay(self):
+        client = Client()
+        token  = issue_token(self.user)
+
+        client.get('/projects')
+        before        = project_list_cache.stats()
+        like_response = client.patch(f'/projects/{self.project.id}', HTTP_AUTHORIZATION=token)
+        liked_project = client.get('/projects', HTTP_AUTHORIZATION=token).json()['data']['projects'][0]
+        anon_project  = client.get('/projects').json()['data']['projects'][0]
+        after         = project_list_cache.stats()
+
+        self.assertEqual(like_response.status_code, 200)
+        self.assertTrue(liked_project['is_liked'])
+        self.assertFalse(anon_project['is_liked'])
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    def test_project_list_not_modified(self):
+        client = Client()
+        etag   = client.get('/projects')['ETag']
+
+        self.assertEqual(client.get('/projects', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(client.get('/projects?sorted=old', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        Donation.objects.create(user=self.user, project=self.project, funding_option=self.option)
+        outbox.drain()
+
+        self.assertEqual(client.get('/projects', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_project_list_cache_invalidated_by_donation(self):
+        client = Client()
+
+        client.get('/projects')
+        Donation.objects.create(user=self.user, project=self.project, funding_option=self.option)
+        outbox.drain()
+        response = client.get('/projects').json()
+
+        self.assertEqual(response['data']['projects'][0]['funding_amount'], 2000.0)
+
+    def test_project_list_cache_invalidation_keeps_boundary(self):
+        client = Client()
+
+        client.get('/projects')
+        Donation.objects.create(user=self.user, project=self.project, funding_option=self.option)
+        outbox.drain()
+
+        with CaptureQueriesContext(connection) as context:
+            client.get('/projects')
+            client.get('/projects?sorted=old')
+
+        self.assertFalse([query['sql'] for query in context.captured_queries if 'MIN(' in query['sql']])
+
+    def test_project_list_cache_invalidated_at_status_boundary(self):
+        client = Client()
+
+        client.get('/projects')
+        project_list_cache.counters.set(project_list_cache.BOUNDARY_KEY, 0, None)
+        before = project_list_cache.stats()
+        client.get('/projects')
+
+        self.assertEqual(project_list_cache.stats()['misses'] - before['misses'], 1)
+
+    def test_project_list_cache_counters_evicted(self):
+        client     = Client()
+        token      = issue_token(self.user)
+        etag       = client.get('/projects')['ETag']
+        user_etag  = client.get('/projects', HTTP_AUTHORIZATION=token)['ETag']
+        generation = project_list_cache.generation()
+
+        project_list_cache.counters.delete(user_project_overlay.version_key(self.user.id))
+
+        self.assertEqual(client.get('/projects', HTTP_IF_NONE_MATCH=user_etag, HTTP_AUTHORIZATION=token).status_code, 200)
+        self.assertEqual(client.get('/projects', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        project_list_cache.counters.delete(project_list_cache.GENERATION_KEY)
+        before = project_list_cache.stats()
+
+        self.assertEqual(client.get('/projects', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertNotEqual(project_list_cache.generation(), generation)
+        self.assertEqual(project_list_cache.stats()['misses'] - before['misses'], 1)
+
+class ProjectQueryPlanTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username          = 'testuser1',
+            email             = 'test1@mail.com',
+            password          = hash_password('12345678'),
+            profile_image_url = 'test.jpg'
+        )
+
+        self.project = Project.objects.create(
+            title           = '타이틀1',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+
+        option = FundingOption.objects.create(
+            amount      = 2000,
+            project     = self.project,
+            remains     = 10,
+            title       = '상품옵션1',
+            description = '상품설명'
+        )
+
+        Donation.objects.create(user=self.user, project=self.project, funding_option=option)
+        Likes.objects.create(user=self.user, project=self.project)
+
+    def test_project_list_query_plan(self):
+        client = Client()
+        token  = issue_token(self.user)
+
+        with QueryPlanCapture() as capture:
+            client.get('/projects?category=카테고리1', HTTP_AUTHORIZATION=token)
+            client.get('/projects?status=ing&liked=true', HTTP_AUTHORIZATION=token)
+
+            for sort_criteria in ('amount', 'people'):
+                first  = client.get(f'/projects?sorted={sort_criteria}&limit=1').json()['data']
+                cursor = first['next_cursor'] or ''
+                client.get(f'/projects?sorted={sort_criteria}&limit=1&cursor={cursor}')
+
+        capture.assert_no_full_scan()
+
+    def test_project_detail_query_plan(self):
+        client = Client()
+
+        with QueryPlanCapture() as capture:
+            client.get(f'/projects/{self.project.id}', HTTP_AUTHORIZATION=issue_token(self.user))
+
+        capture.assert_no_full_scan()
+
+@skipUnless('replica' in settings.DATABASES, "needs a 'replica' alias in DATABASES")
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTest(TestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.user    = User.objects.create(username='testuser1', email='test1@mail.com', password=hash_password('12345678'))
+        self.project = Project.objects.create(
+            title           = '프라이머리',
+            creater         = self.user,
+            summary         = '프로젝트 설명',
+            category        = Category.objects.create(name='카테고리1'),
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )
+        self.option  = FundingOption.objects.create(amount=2000, project=self.project, title='상품옵션1', description='상품설명')
+
+        User.objects.using('replica').bulk_create([User(id=self.user.id, username='testuser1', email='test1@mail.com', password='x')])
+        Category.objects.using('replica').bulk_create([Category(id=self.project.category_id, name='카테고리1')])
+        Project.objects.using('replica').bulk_create([Project(
+            id              = self.project.id,
+            title           = '레플리카',
+            creater_id      = self.user.id,
+            summary         = '프로젝트 설명',
+            category_id     = self.project.category_id,
+            title_image_url = 'test.jpg',
+            target_fund     = 100000,
+            launch_date     = '2021-05-20',
+            end_date        = '2121-05-29'
+        )])
+        ProjectStats.objects.using('replica').bulk_create([ProjectStats(project_id=self.project.id)])
+
+    def tearDown(self):
+        pin_cache().clear()
+
+    def title(self, **headers):
+        return Client().get(f'/projects/{self.project.id}?fields=title', **headers).json()['result']['title']
+
+    def test_replica_router_reads_and_writes(self):
+        router = ReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Project), 'default')
+        self.assertEqual(router.db_for_write(Project), 'default')
+
+        with replica_reads():
+            self.assertEqual(router.db_for_write(Project), 'default')
+            self.assertEqual(Project.objects.get(id=self.project.id).title, '레플리카')
+
+    @override_settings(DATABASE_REPLICAS=['replica', 'default'])
+    def test_replica_router_one_replica_per_block(self):
+        router = ReplicaRouter()
+
+        for _ in range(10):
+            with replica_reads():
+                aliases = {router.db_for_read(Project) for _ in range(20)}
+
+                with replica_reads():
+                    aliases.add(router.db_for_read(Project))
+
+                with replica_reads(False):
+                    self.assertEqual(router.db_for_read(Project), 'default')
+
+            self.assertEqual(len(aliases), 1)
+
+    def test_replica_router_detail_reads_replica(self):
+        self.assertEqual(self.title(), '레플리카')
+        self.assertEqual(self.title(HTTP_AUTHORIZATION=issue_token(self.user)), '레플리카')
+
+    def test_replica_router_sticks_to_primary_after_donation(self):
+        Donation.objects.create(user=self.user, project=self.project, funding_option=self.option)
+
+        self.assertEqual(self.title(HTTP_AUTHORIZATION=issue_token(self.user)), '프라이머리')
+        self.assertEqual(self.title(), '레플리카')
+
+    def test_replica_router_fills_list_cache_from_primary(self):
+        projects = Client().get('/projects?fields=title').json()['data']['projects']
+
+        self.assertEqual([project['title'] for project in projects], ['프라이머리'])
@@ -1,7 +1,11 @@
 from django.urls    import path
-from projects.views import ProjectDetailView, ProjectView
+from projects.views import ProjectDetailView, ProjectLikeView, ProjectHoldView, ProjectBatchView, ProjectLeaderboardView, ProjectView
 
 urlpatterns = [
     path('/<int:id>', ProjectDetailView.as_view()),
+    path('/<int:id>/like', ProjectLikeView.as_view()),
+    path('/<int:id>/holds', ProjectHoldView.as_view()),
+    path('/batch', ProjectBatchView.as_view()),
+    path('/leaderboards', ProjectLeaderboardView.as_view()),
     path('', ProjectView.as_view()),
 ]
\ No newline at end of file
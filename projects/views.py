@@ -1,10 +1,11 @@
 import json
+import hashlib
 from datetime                       import datetime
 from decimal                        import Decimal
 
 from django.views                   import View
 from django.utils.decorators        import method_decorator
-from django.db.models               import Sum, F, Value, When, Case
+from django.db.models               import F, Value, When, Case, Exists, OuterRef, Subquery
 from django.db                      import transaction
 
 from django.http.response           import JsonResponse
@@ -13,104 +14,389 @@ from django.db.models.aggregates    import Count
 from django.utils.decorators        import method_decorator
 from django.db                      import transaction
 from django.conf                    import settings
-
-from .models                        import Category, Project, Tag, FundingOption, Donation
+from django.views.decorators.http   import condition
+from django.views.decorators.vary   import vary_on_headers
+
+from .models                        import Category, Project, Tag, FundingOption, Donation, ProjectStats
+from .search                        import search_projects
+from .cache                         import project_list_cache, user_project_overlay
+from .leaderboards                  import leaderboards
+from .holds                         import reward_holds, SoldOutError, HoldContentionError
+from .signals                       import donations_created
+from .idempotency                   import idempotent
+from .batcher                       import donation_batcher
+from .likes                         import project_likes
 from users.models                   import Likes
 from utils.s3_file_util             import S3FileUtils
-from utils.decorators               import login_required, check_user
+from utils.db_router                import replica_reads, is_reading_replicas, is_pinned_to_primary
+from utils.decorators               import login_required, check_user, read_from_replica
+from utils.pagination               import KeysetPaginator, InvalidCursorError
+from utils.params                   import parse_fields, InvalidParameterError
+from utils.serializers              import ValuesListSerializer
+
+def get_project_version(request, id):
+    # Stats totals (and their version) catch up asynchronously, so the latest donation id is
+    # folded in too: option counts and stock in the body change with every donation.
+    if not hasattr(request, 'project_version'):
+        last_donation           = Donation.objects.filter(project_id=OuterRef('project_id')).order_by('-id').values('id')[:1]
+        request.project_version = ProjectStats.objects.filter(project_id=id)\
+                                                      .annotate(last_donation = Subquery(last_donation))\
+                                                      .values_list('version', 'last_donation')\
+                                                      .first()
+
+    return request.project_version
+
+def project_detail_etag(request, id):
+    version = get_project_version(request, id)
+
+    if version is None:
+        return None
+
+    fields = hashlib.md5(request.GET.get('fields', '').encode('utf-8')).hexdigest()[:8]
+    return f'{id}-{version[0]}.{version[1] or 0}-{request.user.id if request.user else 0}-{fields}'
+
+def project_list_etag(request):
+    return project_list_cache.etag(request.GET, request.user)
 
 class ProjectDetailView(View):
+    MAX_OPTION_QUANTITY = 10
+    MAX_DONATIONS       = 30
+    DETAIL_FIELDS       = {
+        'id'                   : ('id',),
+        'is_liked'             : (),
+        'title_image_url'      : ('title_image_url',),
+        'title'                : ('title',),
+        'category'             : ('category__name',),
+        'creater'              : ('creater__username',),
+        'creater_profile_image': ('creater__profile_image_url',),
+        'creater_introduction' : ('creater__introduction',),
+        'summary'              : ('summary',),
+        'funding_amount'       : (),
+        'target_amount'        : ('target_fund',),
+        'total_sponsor'        : (),
+        'like_count'           : ('like_count',),
+        'end_date'             : ('end_date',),
+        'funding_option'       : ('fundingoption__id', 'fundingoption__amount', 'fundingoption__title',
+                                  'fundingoption__remains', 'fundingoption__description'),
+    }
+
+    @classmethod
+    def detail_rows(cls, fields, user):
+        """
+        One query for everything the detail fields need: a row per funding option (or a single
+        row without them), each carrying the project columns, the stats totals, the user's
+        like flag as an EXISTS and the option's donation count grouped in the same statement.
+        """
+        columns     = list(dict.fromkeys(['id'] + [column for field in fields for column in cls.DETAIL_FIELDS[field]]))
+        annotations = {}
+
+        if user and 'is_liked' in fields:
+            annotations['is_liked'] = Exists(Likes.objects.filter(user_id=user.id, project_id=OuterRef('id')))
+
+        if 'funding_amount' in fields:
+            annotations['funding_amount'] = Coalesce(F('stats__funding_amount'), Decimal(0))
+
+        if 'total_sponsor' in fields:
+            annotations['funding_count'] = Coalesce(F('stats__funding_count'), 0)
+
+        rows = Project.objects.annotate(**annotations).values(*columns, *annotations)
+
+        if 'funding_option' in fields:
+            rows = rows.annotate(selected_funding = Count('fundingoption__donation')).order_by('id', 'fundingoption__id')
+
+        return rows
+
+    @classmethod
+    def group_rows(cls, rows):
+        projects = {}
+
+        for row in rows:
+            project = projects.setdefault(row['id'], dict(row, funding_options=[]))
+
+            if row.get('fundingoption__id') is not None:
+                project['funding_options'].append(row)
+
+        return projects
+
+    @classmethod
+    def serialize(cls, project, fields):
+        result = {
+            'id'                   : lambda: project['id'],
+            "is_liked"             : lambda: bool(project.get('is_liked')),
+            'title_image_url'      : lambda: project['title_image_url'],
+            'title'                : lambda: project['title'],
+            'category'             : lambda: project['category__name'],
+            'creater'              : lambda: project['creater__username'],
+            'creater_profile_image': lambda: project['creater__profile_image_url'],
+            'creater_introduction' : lambda: project['creater__introduction'],
+            'summary'              : lambda: project['summary'],
+            'funding_amount'       : lambda: int(project['funding_amount']),
+            'target_amount'        : lambda: int(project['target_fund']),
+            'total_sponsor'        : lambda: project['funding_count'],
+            'like_count'           : lambda: project['like_count'],
+            'end_date'             : lambda: project['end_date'],
+            "funding_option"       : lambda:
+            [{
+                'option_id'        : int(funding_option['fundingoption__id']),
+                "amount"           : int(funding_option['fundingoption__amount']),
+                "title"            : funding_option['fundingoption__title'],
+                "remains"          : None if funding_option['fundingoption__remains'] is None else int(funding_option['fundingoption__remains']),
+                "description"      : funding_option['fundingoption__description'],
+                "selected_funding" : funding_option['selected_funding']
+            } for funding_option in project['funding_options']],
+        }
+
+        return {field: result[field]() for field in fields}
+
     @method_decorator(check_user())
+    @method_decorator(read_from_replica())
+    @method_decorator(vary_on_headers('Authorization'))
+    # ETag only: updated_at has one-second resolution in Last-Modified, while the version changes on every write.
+    @method_decorator(condition(etag_func=project_detail_etag))
     def get(self, request, id):
         try:
-            project = Project.objects.prefetch_related('fundingoption_set', 'fundingoption_set__donation_set').get(id=id)
-            user    = request.user
-
-            result = {
-                'id'                   : project.id,
-                "is_liked"             : False if not user else Likes.objects.filter(user=user, project=project).exists(),
-                'title_image_url'      : project.title_image_url,
-                'title'                : project.title,
-                'category'             : project.category.name,
-                'creater'              : project.creater.username,
-                'creater_profile_image': project.creater.profile_image_url,
-                'creater_introduction' : project.creater.introduction,
-                'summary'              : project.summary,
-                'funding_amount'       : 0 if project.donation_set.count() == 0 else int(project.donation_set.aggregate(Sum('funding_option__amount'))['funding_option__amount__sum']),
-                'target_amount'        : int(project.target_fund),
-                'total_sponsor'        : project.donation_set.count(),
-                'end_date'             : project.end_date,
-                "funding_option"       :
-                [{
-                    'option_id'        : int(funding_option.id),
-                    "amount"           : int(funding_option.amount),
-                    "title"            : funding_option.title,
-                    "remains"          : None if funding_option.remains is None else int(funding_option.remains),
-                    "description"      : funding_option.description,
-                    "selected_funding" : int(funding_option.donation_set.count())
-                } for funding_option in project.fundingoption_set.all()],
-            }
+            fields   = parse_fields(request.GET.get('fields'), self.DETAIL_FIELDS)
+            projects = self.group_rows(self.detail_rows(fields, request.user).filter(id=id))
+
+            if id not in projects:
+                raise Project.DoesNotExist
+
+            result   = self.serialize(projects[id], fields)
 
             return JsonResponse({'result': result}, status=200)
 
+        except InvalidParameterError:
+            return JsonResponse({'messages': 'INVALID_FIELDS'}, status=400)
+
         except Project.DoesNotExist:
             return JsonResponse({'messages': 'DOES_NOT_EXIST'}, status=404)
 
     @method_decorator(login_required())
     def patch(self, request, id):
         try:
-            user = request.user
-            project = Project.objects.get(id=id)
-            is_liked = Likes.objects.filter(user=user, project=project).exists()
-            
-            if is_liked:
-                Likes.objects.filter(user=user, project=project).delete()
-            else:
-                Likes.objects.create(user = user, project = project)
+            is_liked = project_likes.toggle(request.user, id)
 
-            return JsonResponse({"status": "SUCCESS", 'message': f'is_liked changed to {not is_liked}', 'is_liked': not is_liked}, status=200)
+            return JsonResponse({"status": "SUCCESS", 'message': f'is_liked changed to {is_liked}', 'is_liked': is_liked}, status=200)
 
         except Project.DoesNotExist:
             return JsonResponse({"status": "INVALID_PROJECT_ERROR", 'messages': 'Project does not exist.'}, status=404)
 
     @method_decorator(login_required())
+    @method_decorator(idempotent())
     def put(self, request, id):
         try:
-            data           = json.loads(request.body)
-            option_id      = data['option_id']
-            funding_option = FundingOption.objects.get(id=option_id)
+            data  = json.loads(request.body)
+            items = data['options'] if 'options' in data else [
+                {'option_id': data['option_id'], 'quantity': 1, 'hold_token': data.get('hold_token')}
+            ]
 
-            if funding_option.remains == 0:
-                return JsonResponse({'messages': 'NO_STOCK'}, status=400)
+            quantities  = {}
+            hold_tokens = {}
+
+            for item in items:
+                option_id = int(item['option_id'])
+                quantity  = item.get('quantity', 1)
+
+                if type(quantity) is not int or not 1 <= quantity <= self.MAX_OPTION_QUANTITY or option_id in quantities:
+                    return JsonResponse({'messages': 'INVALID_OPTIONS'}, status=400)
+
+                if item.get('hold_token') and quantity != 1:
+                    return JsonResponse({'messages': 'INVALID_OPTIONS'}, status=400)
+
+                quantities[option_id]  = quantity
+                hold_tokens[option_id] = item.get('hold_token')
+
+            if sum(quantities.values()) > self.MAX_DONATIONS:
+                return JsonResponse({'messages': 'INVALID_OPTIONS'}, status=400)
+
+            if quantities and not any(hold_tokens.values()):
+                result = donation_batcher.submit(request.user, quantities)
+
+                if result is not None:
+                    return JsonResponse({'messages': result}, status={'SUCCESS': 201, 'DONATION_TIMEOUT': 503}.get(result, 400))
+
+            funding_options = FundingOption.objects.in_bulk(list(quantities))
+
+            if not quantities or len(funding_options) != len(quantities):
+                raise FundingOption.DoesNotExist
 
             with transaction.atomic():
-                Donation.objects.create(
+                for option_id in sorted(quantities):
+                    quantity   = quantities[option_id]
+                    hold_token = hold_tokens[option_id]
+
+                    if funding_options[option_id].remains is None:
+                        continue
+
+                    if hold_token and not reward_holds.consume(hold_token, request.user, option_id):
+                        transaction.set_rollback(True)
+                        return JsonResponse({'messages': 'HOLD_EXPIRED'}, status=400)
+
+                    if not hold_token and reward_holds.has_slots(option_id):
+                        transaction.set_rollback(True)
+                        return JsonResponse({'messages': 'HOLD_REQUIRED' if quantity == 1 else 'INVALID_OPTIONS'}, status=400)
+
+                    in_stock = FundingOption.objects.filter(id=option_id, remains__gte=quantity).update(remains=F('remains') - quantity)
+
+                    if not in_stock:
+                        transaction.set_rollback(True)
+                        return JsonResponse({'messages': 'NO_STOCK'}, status=400)
+
+                donations = Donation.create_batch([Donation(
                     user                = request.user,
-                    project             = funding_option.project,
-                    funding_option      = funding_option
-                )
+                    project_id          = funding_options[option_id].project_id,
+                    funding_option      = funding_options[option_id]
+                ) for option_id, quantity in quantities.items() for _ in range(quantity)])
 
-                if funding_option.remains is not None:
-                    funding_option.remains -= 1
-                    funding_option.save()
+                donations_created.send(sender=Donation, donations=donations)
 
             return JsonResponse({'messages': "SUCCESS"}, status=201)
         except KeyError:
             return JsonResponse({'messages': "KEY_ERROR"}, status=400)
+        except (TypeError, ValueError):
+            return JsonResponse({'messages': 'INVALID_OPTIONS'}, status=400)
         except Project.DoesNotExist:
             return JsonResponse({'messages': "PROJECT_ID_DOES_NOT EXIST"}, status=400)
         except FundingOption.DoesNotExist:
             return JsonResponse({'messages': "FUNDING_OPTION_ID_DOES_NOT EXIST"}, status=400)
 
+class ProjectLikeView(View):
+    @method_decorator(login_required())
+    def put(self, request, id):
+        try:
+            project_likes.like(request.user, id)
+            return JsonResponse({"status": "SUCCESS", 'message': 'is_liked changed to True', 'is_liked': True}, status=200)
+
+        except Project.DoesNotExist:
+            return JsonResponse({"status": "INVALID_PROJECT_ERROR", 'messages': 'Project does not exist.'}, status=404)
+
+    @method_decorator(login_required())
+    def delete(self, request, id):
+        try:
+            project_likes.unlike(request.user, id)
+            return JsonResponse({"status": "SUCCESS", 'message': 'is_liked changed to False', 'is_liked': False}, status=200)
+
+        except Project.DoesNotExist:
+            return JsonResponse({"status": "INVALID_PROJECT_ERROR", 'messages': 'Project does not exist.'}, status=404)
+
+class ProjectHoldView(View):
+    @method_decorator(login_required())
+    def post(self, request, id):
+        try:
+            option_id = int(json.loads(request.body)['option_id'])
+
+            if reward_holds.is_sold_out(option_id):
+                return JsonResponse({'messages': 'NO_STOCK'}, status=400)
+
+            funding_option = FundingOption.objects.get(id=option_id, project_id=id)
+
+            if funding_option.remains is None:
+                return JsonResponse({'messages': 'SUCCESS', 'hold_token': None, 'expires_at': None}, status=201)
+
+            hold = reward_holds.claim(request.user, funding_option)
+
+            return JsonResponse({'messages': 'SUCCESS', 'hold_token': hold.token, 'expires_at': hold.expires_at}, status=201)
+
+        except KeyError:
+            return JsonResponse({'messages': "KEY_ERROR"}, status=400)
+        except (TypeError, ValueError):
+            return JsonResponse({'messages': 'INVALID_OPTIONS'}, status=400)
+        except FundingOption.DoesNotExist:
+            return JsonResponse({'messages': "FUNDING_OPTION_ID_DOES_NOT EXIST"}, status=400)
+        except SoldOutError:
+            return JsonResponse({'messages': 'NO_STOCK'}, status=400)
+        except HoldContentionError:
+            return JsonResponse({'messages': 'HOLD_BUSY'}, status=409)
+
+class ProjectBatchView(View):
+    MAX_IDS = 50
+
+    @method_decorator(check_user())
+    @method_decorator(read_from_replica())
+    def get(self, request):
+        try:
+            ids    = list(dict.fromkeys(int(id) for id in request.GET.get('ids', '').split(',') if id))
+            fields = parse_fields(request.GET.get('fields'), ProjectDetailView.DETAIL_FIELDS)
+            user   = request.user
+
+            if not ids or len(ids) > self.MAX_IDS:
+                return JsonResponse({'messages': 'INVALID_IDS'}, status=400)
+
+            projects = ProjectDetailView.group_rows(ProjectDetailView.detail_rows(fields, user).filter(id__in=ids))
+            results  = [ProjectDetailView.serialize(projects[id], fields) for id in ids if id in projects]
+
+            return JsonResponse({'results': results, 'missing': [id for id in ids if id not in projects]}, status=200)
+
+        except ValueError:
+            return JsonResponse({'messages': 'INVALID_IDS'}, status=400)
+
+        except InvalidParameterError:
+            return JsonResponse({'messages': 'INVALID_FIELDS'}, status=400)
+
+class ProjectLeaderboardView(View):
+    def get(self, request):
+        try:
+            boards = parse_fields(request.GET.get('board'), leaderboards.BOARDS)
+        except InvalidParameterError as e:
+            return JsonResponse({"status": "INVALID_PARAMETER_ERROR", "message": e.err_message}, status=400)
+
+        return JsonResponse({'status': "SUCCESS", "data": leaderboards.read(request.GET.get('category'), boards)}, status=200)
+
 class ProjectView(View):
     DEFAULT_AMOUNT      = 1000
     DEFAULT_DESCRIPTION = '선물을 선택하지 않고 밀어만 줍니다'
     DEFAULT_TITLE       = '기본 선물'
+    DEFAULT_LIMIT       = 20
+    MAX_LIMIT           = 100
+    LIST_FIELDS         = {
+        'id'             : ('id', None),
+        'title_image_url': ('title_image_url', None),
+        'title'          : ('title', None),
+        'category'       : ('category__name', None),
+        'creater'        : ('creater__username', None),
+        'summary'        : ('summary', None),
+        'funding_amount' : ('funding_amount', float),
+        'funding_count'  : ('funding_count', None),
+        'like_count'     : ('like_count', None),
+        'target_amount'  : ('target_fund', float),
+        'launch_date'    : ('launch_date', None),
+        'end_date'       : ('end_date', None),
+        'status'         : ('status', None),
+        'progress'       : ('progress', None),
+        'is_liked'       : (None, None),
+        'is_donated'     : (None, None),
+    }
     
     @method_decorator(check_user())
+    @method_decorator(read_from_replica())
+    @method_decorator(vary_on_headers('Authorization'))
+    @method_decorator(condition(etag_func=project_list_etag))
     def get(self, request):
-        queries       = request.GET
-        user          = request.user
+        queries   = request.GET
+        user      = request.user
+        shareable = queries.get('liked') is None and queries.get('donated') is None and not (user and is_pinned_to_primary(user.id))
+        data      = project_list_cache.get(queries) if shareable else None
+
+        if data is None:
+            try:
+                # Pages that go into the shared cache are read from the primary, so a replica
+                # lagging behind an invalidation cannot be cached under the new generation.
+                with replica_reads(not shareable and is_reading_replicas()):
+                    data = self.get_project_list(queries, user)
+            except InvalidParameterError as e:
+                return JsonResponse({"status": "INVALID_PARAMETER_ERROR", "message": e.err_message}, status=400)
+            except InvalidCursorError as e:
+                return JsonResponse({"status": "INVALID_CURSOR_ERROR", "message": e.err_message}, status=400)
+
+            if shareable:
+                project_list_cache.set(queries, data)
+
+        if user:
+            data = user_project_overlay.apply(user, data)
+
+        return JsonResponse({'status': "SUCCESS", "data": data}, status=200)
+
+    def get_project_list(self, queries, user):
         progress_min  = queries.get('progressMin')
         progress_max  = queries.get('progressMax')
         amount_min    = queries.get('amountMin')
@@ -119,8 +405,16 @@ class ProjectView(View):
         status        = queries.get('status')
         liked         = queries.get('liked')
         donated       = queries.get('donated')
-        sort_criteria = queries.get('sorted', 'default')
         search        = queries.get('search')
+        sort_criteria = queries.get('sorted', 'relevance' if search else 'default')
+        cursor        = queries.get('cursor')
+        fields        = parse_fields(queries.get('fields'), self.LIST_FIELDS, always=('id',))
+        now           = datetime.now()
+
+        try:
+            limit = min(max(int(queries.get('limit', self.DEFAULT_LIMIT)), 1), self.MAX_LIMIT)
+        except ValueError:
+            raise InvalidParameterError("limit must be an integer.")
 
         filter_set = {
             'progress__gte'      : progress_min,
@@ -128,58 +422,66 @@ class ProjectView(View):
             'funding_amount__gte': amount_min,
             'funding_amount__lte': amount_max,
             'category__name'     : category,
-            'status'             : status,
-            'is_liked'           : True if liked is not None else False,
-            'is_donated'         : True if donated is not None else False,
         }
 
         filter_set = { k: v for k, v in filter_set.items() if v }
 
         sortby_set = {
-            'default': '-created_at',
-            'latest' : '-created_at',
-            'people' : '-funding_count',
-            'amount' : '-funding_amount',
-            'old'    : 'end_date'
+            'default'  : '-created_at',
+            'latest'   : '-created_at',
+            'people'   : '-stats__funding_count',
+            'amount'   : '-stats__funding_amount',
+            'likes'    : '-like_count',
+            'old'      : 'end_date',
+            'relevance': '-search_rank',
         }
 
-        project_list = Project.objects.all().select_related('category', 'creater')\
-                                            .prefetch_related('donation_set', 'likes_set')\
-                                            .annotate(funding_amount = Coalesce(Sum('donation__funding_option__amount'), Decimal(0)))\
-                                            .annotate(funding_count = Coalesce(Count('donation'), 0))\
-                                            .annotate(progress = 100 * F('funding_amount')/F('target_fund'))\
-                                            .annotate(status = Case(When(end_date__lt = datetime.now(), then=Value("done")),
-                                                                    When(launch_date__gt = datetime.now(), then=Value("scheduled")),
-                                                                    default=Value("ing")))\
-                                            .annotate(is_liked = Case(When(likes__user = user, then=Value(True)),
-                                                                      default=Value(False)))\
-                                            .annotate(is_donated = Case(When(donation__user = user, then=Value(True)),
-                                                                      default=Value(False)))\
-                                            .filter(**filter_set)\
-                                            .order_by(sortby_set[sort_criteria])
+        if sort_criteria == 'relevance' and not search:
+            sort_criteria = 'default'
+
+        # Stats sorts seek on project_stats itself (every project has a row), so its
+        # (value, project_id) indexes serve the ORDER BY instead of a sort over a LEFT JOIN.
+        sort_field   = sortby_set[sort_criteria].lstrip('-')
+        tiebreak     = 'stats__project_id' if sort_field.startswith('stats__') else 'id'
+        required     = set(fields) | set(key.split('__')[0] for key in filter_set) | {sort_field}
+        serializer   = ValuesListSerializer(self.LIST_FIELDS, fields, extra_lookups=(sort_field, tiebreak))
+        project_list = Project.objects.all() if tiebreak == 'id' else Project.objects.filter(stats__isnull=False)
+
+        if required & {'funding_amount', 'progress'}:
+            project_list = project_list.annotate(funding_amount = Coalesce(F('stats__funding_amount'), Decimal(0)))
+
+        if 'funding_count' in required:
+            project_list = project_list.annotate(funding_count = Coalesce(F('stats__funding_count'), 0))
+
+        if 'progress' in required:
+            project_list = project_list.annotate(progress = 100 * F('funding_amount')/F('target_fund'))
+
+        if 'status' in required:
+            project_list = project_list.annotate(status = Case(When(end_date__lt = now, then=Value("done")),
+                                                               When(launch_date__gt = now, then=Value("scheduled")),
+                                                               default=Value("ing")))
+
+        project_list = project_list.filter(**filter_set)
+
+        if status:
+            project_list = project_list.filter_status(status, now)
+
+        if liked is not None:
+            project_list = project_list.filter(id__in=Likes.objects.filter(user=user).values('project_id'))
+
+        if donated is not None:
+            project_list = project_list.filter(id__in=Donation.objects.filter(user=user).values('project_id'))
 
         if search:
-            project_list = project_list.filter(title__contains=search) | project_list.filter(summary__contains=search)
-
-        projects = [{
-            'id'             : project.id,
-            'title_image_url': project.title_image_url,
-            'title'          : project.title,
-            'category'       : project.category.name,
-            'creater'        : project.creater.username,
-            'summary'        : project.summary,
-            'funding_amount' : float(project.funding_amount),
-            'funding_count'  : project.funding_count,
-            'target_amount'  : float(project.target_fund),
-            'launch_date'    : project.launch_date,
-            'end_date'       : project.end_date,
-            'status'         : project.status,
-            'progress'       : project.progress,
-            'is_liked'       : project.is_liked if user else False,
-            'is_donated'     : project.is_donated if user else False,
-        } for project in project_list]
-
-        return JsonResponse({'status': "SUCCESS", "data": {'num_projects': len(projects), 'projects': projects} }, status=200)
+            project_list = search_projects(project_list, search)
+
+        ordering          = sortby_set[sort_criteria]
+        paginator         = KeysetPaginator(ordering, limit, cursor_value=serializer.getter(sort_field, tiebreak), tiebreak=tiebreak,
+                                            scope=f'{ordering}:{search}' if sort_criteria == 'relevance' else ordering)
+        rows, next_cursor = paginator.paginate(project_list.values_list(*serializer.lookups), cursor)
+        projects          = serializer.serialize(rows)
+
+        return {'num_projects': len(projects), 'projects': projects, 'next_cursor': next_cursor}
 
     @method_decorator(login_required())
     def post(self, request):
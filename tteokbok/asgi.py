@@ -13,4 +13,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tteokbok.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from projects.stream import funding_stream_router
+
+application = funding_stream_router(django_application)
@@ -1,3 +1,4 @@
+import tempfile
 from pathlib import Path
 import my_settings as my_settings
 from my_settings import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_STORAGE_BUCKET_NAME, AWS_S3_CUSTOM_DOMAIN, AWS_S3_FILE_URL
@@ -70,6 +71,58 @@ WSGI_APPLICATION = 'tteokbok.wsgi.application'
 
 DATABASES = my_settings.DATABASES
 
+# Aliases from DATABASES that views decorated with read_from_replica may read from.
+# A user who just donated or liked reads from the primary for REPLICA_PIN_SECONDS; the
+# pins are kept in REPLICA_PIN_CACHE, which must be shared by every worker and must not
+# evict them early.
+
+DATABASE_REPLICAS   = getattr(my_settings, 'DATABASE_REPLICAS', [])
+DATABASE_ROUTERS    = ['utils.db_router.ReplicaRouter']
+REPLICA_PIN_SECONDS = getattr(my_settings, 'REPLICA_PIN_SECONDS', 5)
+REPLICA_PIN_CACHE   = getattr(my_settings, 'REPLICA_PIN_CACHE', 'counters')
+
+
+# How long a donation Idempotency-Key is remembered; expired keys are removed by
+# the purge_idempotency_keys management command.
+
+IDEMPOTENCY_KEY_SECONDS = getattr(my_settings, 'IDEMPOTENCY_KEY_SECONDS', 60 * 60 * 24)
+
+
+# Group commit for donation PUTs: requests that are not already inside a transaction
+# are written by one thread per process, DONATION_BATCH_SIZE at most every
+# DONATION_BATCH_WINDOW_MS milliseconds.
+
+DONATION_BATCHING        = getattr(my_settings, 'DONATION_BATCHING', False)
+DONATION_BATCH_WINDOW_MS = getattr(my_settings, 'DONATION_BATCH_WINDOW_MS', 5)
+DONATION_BATCH_SIZE      = getattr(my_settings, 'DONATION_BATCH_SIZE', 200)
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# 'default' is per process. The listing cache and the other cross-request flags live in
+# 'shared', which every worker on the host sees. Its generation token, the per-user
+# versions and the replica pins live in 'counters': it only ever holds those small keys,
+# so listing pages can't push them out, and MAX_ENTRIES is raised well above the number
+# of active users. Point both at memcached or redis when running on several hosts.
+
+CACHES = getattr(my_settings, 'CACHES', {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND' : 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(Path(tempfile.gettempdir()) / 'tteokbok_cache'),
+    },
+    'counters': {
+        'BACKEND' : 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(Path(tempfile.gettempdir()) / 'tteokbok_counters'),
+        'OPTIONS' : {'MAX_ENTRIES': 100000},
+    },
+})
+
+PROJECT_LIST_CACHE    = getattr(my_settings, 'PROJECT_LIST_CACHE', 'shared')
+PROJECT_COUNTER_CACHE = getattr(my_settings, 'PROJECT_COUNTER_CACHE', 'counters')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
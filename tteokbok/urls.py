@@ -3,4 +3,5 @@ from django.urls import path, include
 urlpatterns = [
     path('projects', include('projects.urls')),
     path('users', include('users.urls')),
+    path('funds', include('funds.urls')),
 ]
@@ -1,4 +1,5 @@
-from django.db              import models
+from django.db              import models, transaction
+from django.db.models       import Count, Min
 from django.forms.models    import model_to_dict
 
 class User(models.Model):
@@ -25,7 +26,31 @@ class Likes(models.Model):
     project = models.ForeignKey('projects.Project', on_delete=models.CASCADE)
 
     class Meta():
-        db_table = 'likes'
+        db_table    = 'likes'
+        constraints = [
+            # Run ``manage.py dedupe_likes`` before applying this to a table that predates it.
+            models.UniqueConstraint(fields=['user', 'project'], name='likes_user_project_unique'),
+        ]
+
+    @classmethod
+    def remove_duplicates(cls):
+        """
+        Delete all but the oldest like of every (user, project) pair that was liked more than
+        once, so ``likes_user_project_unique`` can be added. Returns the number of rows deleted.
+        """
+        duplicates = cls.objects.values('user_id', 'project_id')\
+                                .annotate(keep=Min('id'), count=Count('id'))\
+                                .filter(count__gt=1)\
+                                .order_by()
+        deleted    = 0
+
+        with transaction.atomic():
+            for duplicate in duplicates:
+                deleted += cls.objects.filter(user_id=duplicate['user_id'], project_id=duplicate['project_id'])\
+                                      .exclude(id=duplicate['keep'])\
+                                      .delete()[0]
+
+        return deleted
 
     def __str__(self):
         return f'{self.user.username} : {self.project.title}'
@@ -0,0 +1,68 @@
+import random
+from contextlib         import contextmanager
+from contextvars        import ContextVar
+
+from django.conf        import settings
+from django.core.cache  import caches
+from django.db          import DEFAULT_DB_ALIAS
+
+_replica_alias = ContextVar('replica_alias', default=None)
+
+PIN_KEY_PREFIX = 'db:primary'
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, 'DATABASE_REPLICAS', []) if alias in settings.DATABASES]
+
+@contextmanager
+def replica_reads(enabled = True):
+    """
+    Route the reads inside the block to one replica, picked on entry (or inherited from an
+    enclosing block), so every query of a request sees the same replication lag.
+    ``enabled=False`` sends them back to the primary.
+    """
+    replicas = replica_aliases()
+    alias    = (_replica_alias.get() or random.choice(replicas)) if enabled and replicas else None
+    token    = _replica_alias.set(alias)
+
+    try:
+        yield
+    finally:
+        _replica_alias.reset(token)
+
+def is_reading_replicas():
+    return _replica_alias.get() is not None
+
+def pin_cache():
+    return caches[getattr(settings, 'REPLICA_PIN_CACHE', 'counters')]
+
+def pin_to_primary(user_id):
+    """
+    Send ``user_id``'s reads to the primary for ``REPLICA_PIN_SECONDS`` so that a user who
+    just donated or liked something sees it, even while the replicas are still catching up.
+    """
+    if not replica_aliases():
+        return
+
+    pin_cache().set(f'{PIN_KEY_PREFIX}:{user_id}', True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+
+def is_pinned_to_primary(user_id):
+    if not replica_aliases():
+        return False
+
+    return bool(pin_cache().get(f'{PIN_KEY_PREFIX}:{user_id}'))
+
+class ReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to the alias from ``DATABASE_REPLICAS`` that
+    the enclosing ``replica_reads()`` picked, which the ``read_from_replica`` view decorator
+    opens for read-only views. Every other read, including those of views that write, stays
+    on the primary as before.
+    """
+    def db_for_read(self, model, **hints):
+        return _replica_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -1,10 +1,11 @@
 import jwt
 import functools
 
-from django.http    import JsonResponse
+from django.http        import JsonResponse
 
-from users.models   import User
-from utils.auth     import get_user_from_jwt, decode_jwt
+from users.models       import User
+from utils.auth         import get_user_from_jwt, decode_jwt
+from utils.db_router    import replica_reads, is_pinned_to_primary
 
 def login_required():
     def decorator(function):
@@ -55,4 +56,16 @@ def check_user():
                 return function(request, *args, **kwargs)
 
         return wrapper_check_user
-    return decorator
\ No newline at end of file
+    return decorator
+
+def read_from_replica():
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper_read_from_replica(request, *args, **kwargs):
+            user = getattr(request, 'user', None)
+
+            with replica_reads(not (user and is_pinned_to_primary(user.id))):
+                return function(request, *args, **kwargs)
+
+        return wrapper_read_from_replica
+    return decorator
@@ -0,0 +1,49 @@
+import re
+
+from django.db              import connection
+from django.test.utils      import CaptureQueriesContext
+
+SQLITE_SCAN = re.compile(r'\bSCAN (?:TABLE )?(?!CONSTANT\b|TABLE\b)(\w+)\b( USING)?')
+
+class QueryPlanCapture(CaptureQueriesContext):
+    """
+    Captures every query run inside the block and explains the SELECTs afterwards.
+
+    A full scan is a SQLite ``SCAN <table>`` step that either has no index or has to feed a
+    temp b-tree sort (so a LIMIT cannot stop it early), or a MySQL ``type=ALL`` access with
+    no usable key. MySQL is allowed to pick ``ALL`` over tiny test tables when
+    an index exists, so only scans without ``possible_keys`` are reported there.
+    """
+    def __init__(self, using = connection):
+        super().__init__(using)
+
+    @property
+    def selects(self):
+        return [query['sql'] for query in self.captured_queries if query['sql'].lstrip().upper().startswith('SELECT')]
+
+    def explain(self, sql):
+        with self.connection.cursor() as cursor:
+            if self.connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                return [row[-1] for row in cursor.fetchall()]
+
+            cursor.execute(f'EXPLAIN {sql}')
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def full_scans(self, sql):
+        plan = self.explain(sql)
+
+        if self.connection.vendor == 'sqlite':
+            sorted_in_memory = any('TEMP B-TREE FOR ORDER BY' in step for step in plan)
+            scans            = [SQLITE_SCAN.search(step) for step in plan]
+            return [scan.group(1) for scan in scans if scan and (not scan.group(2) or sorted_in_memory)]
+
+        return [step['table'] for step in plan if step.get('type') == 'ALL' and not step.get('possible_keys')]
+
+    def assert_no_full_scan(self, allow = ()):
+        for sql in self.selects:
+            scans = [table for table in self.full_scans(sql) if table not in allow]
+
+            if scans:
+                raise AssertionError(f'Full scan of {", ".join(scans)} in: {sql}')
@@ -0,0 +1,92 @@
+import json
+import base64
+import binascii
+from datetime                   import datetime
+from decimal                    import Decimal, InvalidOperation
+
+from django.core.exceptions     import ValidationError
+from django.db.models           import Q
+
+class InvalidCursorError(Exception):
+    def __init__(self, err_msg = None):
+        super().__init__()
+        self.err_message = err_msg
+
+CURSOR_TYPES = {
+    'datetime': (datetime, lambda value: value.isoformat(), datetime.fromisoformat),
+    'decimal' : (Decimal,  str,                              Decimal),
+    'float'   : (float,    float,                            float),
+    'int'     : (int,      int,                              int),
+}
+
+def encode_cursor(value, pk, scope = ''):
+    for type_name, (value_type, dump, _) in CURSOR_TYPES.items():
+        if isinstance(value, value_type):
+            payload = json.dumps([scope, type_name, dump(value), pk], separators=(',', ':'))
+            return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    raise TypeError(f'Unsupported cursor value type: {type(value).__name__}')
+
+def decode_cursor(cursor, scope = ''):
+    try:
+        padded                             = cursor + '=' * (-len(cursor) % 4)
+        cursor_scope, type_name, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+
+        if cursor_scope != scope:
+            raise InvalidCursorError("Invalid cursor.")
+
+        return CURSOR_TYPES[type_name][2](value), int(pk)
+
+    except (ValueError, TypeError, KeyError, InvalidOperation, binascii.Error, UnicodeError):
+        raise InvalidCursorError("Invalid cursor.")
+
+class KeysetPaginator:
+    """
+    Seek-method pagination over ``ordering`` with ``tiebreak`` (``id`` by default) as the
+    tie-breaker.
+
+    Each page is fetched with a ``(field, id) < (value, id)`` style predicate taken from an
+    opaque cursor, so the cost of a page does not grow with how deep the client has scrolled.
+    Sorting on a related table's column should break ties on that table's key too, so one
+    ``(field, key)`` index there can serve both the order and the seek. Cursors carry
+    ``scope`` (the ordering unless the caller passes something more specific) and are
+    rejected by any paginator with a different one.
+    """
+    def __init__(self, ordering, limit, cursor_value = None, tiebreak = 'id', scope = None):
+        self.descending   = ordering.startswith('-')
+        self.field        = ordering.lstrip('-')
+        self.tiebreak     = tiebreak
+        self.scope        = ordering if scope is None else scope
+        self.limit        = limit
+        self.cursor_value = cursor_value or (lambda row: (getattr(row, self.field), row.id))
+
+    @property
+    def ordering(self):
+        prefix = '-' if self.descending else ''
+        return (f'{prefix}{self.field}', f'{prefix}{self.tiebreak}')
+
+    def seek(self, queryset, cursor):
+        value, pk = decode_cursor(cursor, self.scope)
+        lookup    = 'lt' if self.descending else 'gt'
+
+        try:
+            return queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value}) | Q(**{self.field: value, f'{self.tiebreak}__{lookup}': pk})
+            )
+        except (TypeError, ValueError, ValidationError):
+            raise InvalidCursorError("Invalid cursor.")
+
+    def paginate(self, queryset, cursor = None):
+        queryset = queryset.order_by(*self.ordering)
+
+        if cursor:
+            queryset = self.seek(queryset, cursor)
+
+        rows        = list(queryset[:self.limit + 1])
+        next_cursor = None
+
+        if len(rows) > self.limit:
+            rows        = rows[:self.limit]
+            next_cursor = encode_cursor(*self.cursor_value(rows[-1]), self.scope)
+
+        return rows, next_cursor
@@ -0,0 +1,21 @@
+class InvalidParameterError(Exception):
+    def __init__(self, err_msg = None):
+        super().__init__()
+        self.err_message = err_msg
+
+def parse_fields(fields, available, always = ()):
+    """
+    Resolve a comma separated ``fields`` query parameter against ``available``.
+    Returns every available field when nothing was requested, always in ``available`` order,
+    and never drops the ``always`` fields.
+    """
+    if not fields:
+        return list(available)
+
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown   = sorted(requested - set(available))
+
+    if unknown:
+        raise InvalidParameterError(f'Unknown fields: {", ".join(unknown)}')
+
+    return [field for field in available if field in requested or field in always]
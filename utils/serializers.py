@@ -0,0 +1,40 @@
+from operator import itemgetter
+
+class ValuesListSerializer:
+    """
+    Turns ``values_list()`` rows into response dicts without building model instances.
+
+    ``spec`` maps every output key to ``(lookup, convert)``. A ``None`` lookup marks a key that
+    is filled with ``default`` instead of read from the database. The column order, the
+    key-to-index mapping and the converters are worked out once per request, so the per-row
+    cost is one ``zip`` plus the conversions that are actually needed.
+    """
+    def __init__(self, spec, fields, extra_lookups = (), default = False):
+        self.keys       = [field for field in fields if spec[field][0]]
+        self.lookups    = [spec[field][0] for field in self.keys]
+        self.converters = [(field, spec[field][1]) for field in self.keys if spec[field][1]]
+        self.constants  = {field: default for field in fields if not spec[field][0]}
+
+        for lookup in extra_lookups:
+            if lookup not in self.lookups:
+                self.lookups.append(lookup)
+
+    def getter(self, *lookups):
+        return itemgetter(*[self.lookups.index(lookup) for lookup in lookups])
+
+    def serialize(self, rows):
+        keys, converters, constants = self.keys, self.converters, self.constants
+        results                     = []
+
+        for row in rows:
+            result = dict(zip(keys, row))
+
+            for key, convert in converters:
+                result[key] = convert(result[key])
+
+            if constants:
+                result.update(constants)
+
+            results.append(result)
+
+        return results